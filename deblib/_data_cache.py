@@ -0,0 +1,70 @@
+""" Support for caching the parsed contents of the package's text data files. """
+from typing import Any
+from pathlib import Path
+from hashlib import md5
+from contextlib import suppress
+from itertools import chain
+import glob
+import os
+
+import numpy as np
+
+def cached_loadtxt(file: Path, dtype: np.dtype, *args, **kwargs) -> np.ndarray:
+    """
+    Equivalent to np.loadtxt(file, dtype, *args, **kwargs) except that the parsed array is
+    saved to a sibling .npy file which is used in preference to re-parsing the text on
+    subsequent calls, including those from other processes. The .npy file is memory mapped
+    read-only, so the OS page cache is shared by all processes using it and the data are
+    not duplicated in each. For consistency, the array is always returned as read-only.
+
+    The cache file name includes a hash of the loadtxt args, so different selections from
+    the same file are cached separately, and it is ignored if older than the text file.
+    If the cache cannot be written (i.e.: a read-only install) the text is parsed each time.
+    Whenever a cache file is written, any for this text file which are older than it are deleted.
+
+    :file: the text file to load
+    :dtype: the dtype to load the data as
+    :args: further positional args for np.loadtxt
+    :kwargs: further keyword args for np.loadtxt
+    :returns: the loaded, read-only array
+    """
+    npy_file = file.with_name(f"{file.name}.{_hash_args(dtype, args, kwargs)}.npy")
+    try:
+        if npy_file.stat().st_mtime >= file.stat().st_mtime:
+            return np.load(npy_file, mmap_mode="r").view(np.ndarray)
+    except (OSError, ValueError):
+        pass
+
+    table = np.loadtxt(file, dtype, *args, **kwargs)
+    # Write to a temp file and then move it into place so that other processes
+    # can never see a partially written cache file.
+    tmp_file = npy_file.with_name(f"{npy_file.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_file, mode="wb") as f:
+            np.save(f, table)
+        os.replace(tmp_file, npy_file)
+        _prune_stale_caches(file)
+    except OSError:
+        with suppress(OSError):
+            tmp_file.unlink(missing_ok=True)
+    table.flags.writeable = False
+    return table
+
+
+def _prune_stale_caches(file: Path):
+    """
+    Deletes any cache (or leftover temp) files for the text file which are older than it. These
+    will never be used again, as the text has since changed, which will also be the case after
+    the package is updated. Caches of the current text are kept, whatever their args.
+    """
+    file_mtime = file.stat().st_mtime
+    name = glob.escape(file.name)
+    for cache_file in chain(file.parent.glob(f"{name}.*.npy"), file.parent.glob(f"{name}.*.tmp")):
+        with suppress(OSError):
+            if cache_file.stat().st_mtime < file_mtime:
+                cache_file.unlink()
+
+
+def _hash_args(*args: Any) -> str:
+    """ A short, stable hash of the repr of the passed args. """
+    return md5(repr(args).encode("utf8"), usedforsecurity=False).hexdigest()[:12]
@@ -1,68 +1,154 @@
 """ Module publishing methods for lookup up Limb Darkening coefficients. """
-from typing import Tuple, List
+from typing import Tuple, List, Callable, Union
 from inspect import getsourcefile
 from pathlib import Path
 from functools import lru_cache
 
 import numpy as np
 
+from ._data_cache import cached_loadtxt
+
 _this_dir = Path(getsourcefile(lambda:0)).parent
 
+# The supported missions keyed on their lower case names
+_MISSIONS = { "tess": "TESS", "kepler": "Kepler" }
+
 
-def lookup_quad_coefficients(logg: float,
-                             t_eff: float,
+def lookup_quad_coefficients(logg: Union[float, np.ndarray[float]],
+                             t_eff: Union[float, np.ndarray[float]],
                              mission: str="TESS") \
-                                -> Tuple[float, float]:
+                                -> Tuple[Union[float, np.ndarray[float]],
+                                         Union[float, np.ndarray[float]]]:
     """
     Get the quad limb darkening (a, b) coefficients nearest to the passed
     log(g) and T_eff values. Data from Claret2018 (J/A+A/618/A20) tables 5 (TESS) & 9 (Kepler).
 
     :logg: the requested log(g) - nearest value will be used
     :t_eff: the requested T_eff in K - nearest value will be used
-    :mission: currently only supports TESS or Kepler coefficients
-    :returns: tuple (a, b) where a is the linear and b the quadratic coefficient
+    :mission: currently only supports TESS or Kepler coefficients (case insensitive)
+    :returns: tuple (a, b) where a is the linear and b the quadratic coefficient, or if
+    either logg or t_eff is an ndarray, a tuple of ndarrays of their broadcast shape
     """
-    table = _quad_ld_coeffs_table(mission)
-    return _lookup_nearest_coeffs(table, logg, t_eff, ["a", "b"])
+    return _lookup_nearest_coeffs(_quad_ld_coeffs_table, mission, logg, t_eff, ("a", "b"))
 
 
-def lookup_pow2_coefficients(logg: float,
-                             t_eff: float,
+def lookup_pow2_coefficients(logg: Union[float, np.ndarray[float]],
+                             t_eff: Union[float, np.ndarray[float]],
                              mission: str="TESS") \
-                                -> Tuple[float, float]:
+                                -> Tuple[Union[float, np.ndarray[float]],
+                                         Union[float, np.ndarray[float]]]:
     """
     Get the quad limb darkening (a, b) coefficients nearest to the passed
     log(g) and T_eff values. Data from Claret+2023 (J/A+A/674/A63) table 1.
 
     :logg: the requested log(g) - nearest value will be used
     :t_eff: the requested T_eff in K - nearest value will be used
-    :mission: currently only supports TESS or Kepler coefficients
-    :returns: tuple (a, b) where a is the linear and b the quadratic coefficient
+    :mission: currently only supports TESS or Kepler coefficients (case insensitive)
+    :returns: tuple (a, b) where a is the linear and b the quadratic coefficient, or if
+    either logg or t_eff is an ndarray, a tuple of ndarrays of their broadcast shape
     """
-    table = _pow2_ld_coeffs_table(mission)
-    return _lookup_nearest_coeffs(table, logg, t_eff, ["g", "h"])
+    return _lookup_nearest_coeffs(_pow2_ld_coeffs_table, mission, logg, t_eff, ("g", "h"))
 
 
-def _lookup_nearest_coeffs(table: np.ndarray,
-                            logg: float,
-                            t_eff: float,
-                            coeffs_fields: List) \
-                                -> Tuple[float]:
+def _lookup_nearest_coeffs(table_func: Callable[[str], np.ndarray],
+                           mission: str,
+                           logg: Union[float, np.ndarray[float]],
+                           t_eff: Union[float, np.ndarray[float]],
+                           coeffs_fields: Tuple[str, ...]) \
+                                -> Tuple[Union[float, np.ndarray[float]]]:
     """
     Performs a nearest match lookup with logg and t_eff to get a tuple of the
-    coefficient values in fields. 
+    coefficient values in fields. If either logg or t_eff is an ndarray the lookup
+    is vectorized over them, giving a tuple of ndarrays.
+    """
+    # Normalize the mission so all variations share the same cached columns
+    mission = _MISSIONS[mission.strip().lower()]
+    logg_values, slice_bounds, teffs, coeffs = _logg_sorted_columns(table_func, mission,
+                                                                    coeffs_fields)
+    if np.ndim(logg) or np.ndim(t_eff):
+        return _lookup_nearest_coeffs_batch(logg_values, slice_bounds, teffs, coeffs, logg, t_eff)
+
+    # Work with plain floats so the binary searches don't have to coerce other types of key
+    logg, t_eff = float(logg), float(t_eff)
+
+    # The logg values are a regular grid in 0.5 dex steps, so we can round the requested
+    # value directly to an index into them (clamped to the grid) to get the bounds of its rows
+    ix = round(logg * 2) - round(logg_values[0] * 2)
+    ix = min(max(ix, 0), len(logg_values) - 1)
+    row_from, row_to = slice_bounds[ix], slice_bounds[ix+1]
+
+    # Finally hone in on the nearest Teff value. Within each logg slice the Teffs are ascending
+    # so we can binary search then pick the nearer of the two neighbours (the lower on a tie).
+    ix = int(np.searchsorted(teffs[row_from:row_to], t_eff)) + row_from
+    ix = min(max(ix, row_from + 1), row_to - 1)
+    ix -= abs(teffs[ix-1] - t_eff) <= abs(teffs[ix] - t_eff)
+    return tuple(coeffs[ix])
+
+
+def _lookup_nearest_coeffs_batch(logg_values: np.ndarray[float],
+                                 slice_bounds: np.ndarray[int],
+                                 teffs: np.ndarray[float],
+                                 coeffs: np.ndarray[float],
+                                 logg: Union[float, np.ndarray[float]],
+                                 t_eff: Union[float, np.ndarray[float]]) \
+                                    -> Tuple[np.ndarray[float]]:
+    """
+    The vectorized equivalent of the scalar lookup in _lookup_nearest_coeffs(), over the
+    broadcast logg and t_eff values and the columns from _logg_sorted_columns().
+    """
+    logg, t_eff = np.broadcast_arrays(np.asarray(logg, dtype=float),
+                                      np.asarray(t_eff, dtype=float))
+
+    # np.round() rounds half to even, the same as the builtin round() in the scalar lookup
+    logg_ixs = np.round(logg * 2).astype(int) - round(logg_values[0] * 2)
+    np.clip(logg_ixs, 0, len(logg_values) - 1, out=logg_ixs)
+    rows_from, rows_to = slice_bounds[logg_ixs], slice_bounds[logg_ixs + 1]
+
+    # The Teffs are only ascending within each logg slice, so we binary search each slice
+    # for all of the requested values which fall within it (there are few distinct slices)
+    ixs = np.empty(logg_ixs.shape, dtype=int)
+    for logg_ix in np.unique(logg_ixs):
+        mask = logg_ixs == logg_ix
+        row_from, row_to = slice_bounds[logg_ix], slice_bounds[logg_ix+1]
+        ixs[mask] = np.searchsorted(teffs[row_from:row_to], t_eff[mask]) + row_from
+    np.clip(ixs, rows_from + 1, rows_to - 1, out=ixs)
+    ixs -= np.abs(teffs[ixs-1] - t_eff) <= np.abs(teffs[ixs] - t_eff)
+    return tuple(coeffs[ixs, col] for col in range(coeffs.shape[1]))
+
+
+@lru_cache
+def _logg_sorted_columns(table_func: Callable[[str], np.ndarray],
+                         mission: str,
+                         coeffs_fields: Tuple[str, ...]) \
+                            -> Tuple[np.ndarray[float], np.ndarray[int],
+                                     np.ndarray[float], np.ndarray[float]]:
     """
-    # The logg values are in 0.5 dex steps
-    logg = round(logg * 2) / 2
-    logg = max(table["logg"].min(), logg)
-    logg = min(table["logg"].max(), logg)
-    masked = table[(table["logg"] == logg) & (table["Z"] == 0.0)]
+    Gets the Teff and coefficient columns of the Z == 0.0 rows of the chosen table stably
+    sorted on logg, so the rows for each logg value are contiguous and retain their
+    (ascending) Teff ordering. Also gets the distinct logg values, which must be a regular grid
+    in 0.5 dex steps, and the bounds of the rows for each; the rows for logg_values[i] are
+    [slice_bounds[i]:slice_bounds[i+1]].
 
-    # Currently don't filter on Z as they're all 0.0
+    The columns are held as separate contiguous arrays, rather than as a structured array of
+    records, so a lookup only touches the Teff values it searches and the coeffs it returns.
 
-    # Finally hone in on the nearest Teff value
-    coeffs = masked[np.argmin(abs(masked["Teff"] - t_eff))][coeffs_fields]
-    return tuple(coeffs)
+    :table_func: the function for getting the table
+    :mission: the mission to get the table for
+    :coeffs_fields: the names of the coefficient fields to get
+    :returns: tuple of (logg_values, slice_bounds, teffs, coeffs[#rows, #coeffs_fields])
+    """
+    table = table_func(mission)
+    table = table[table["Z"] == 0.0]
+    table = table[np.argsort(table["logg"], kind="stable")]
+    logg_values, slice_starts = np.unique(table["logg"], return_index=True)
+    slice_bounds = np.append(slice_starts, len(table))
+    if not np.all(np.diff(logg_values) == 0.5):
+        raise ValueError(f"Expected the {mission} logg values to be in 0.5 dex steps")
+    teffs = np.ascontiguousarray(table["Teff"])
+    coeffs = np.column_stack([table[field] for field in coeffs_fields])
+    for arr in [logg_values, slice_bounds, teffs, coeffs]:
+        arr.flags.writeable = False # these are cached & shared
+    return logg_values, slice_bounds, teffs, coeffs
 
 # Using funcs with lru_cache to gives us caching and lazy loading of these data
 @lru_cache
@@ -77,9 +163,8 @@ def _quad_ld_coeffs_table(mission: str="TESS") -> np.ndarray[float]:
         # Kepler quad coeffs in Tables 8 (PHOENIX-DFIFT) & 9 (PHOENIX-COND)
         "Kepler": _this_dir / "data/limb_darkening/quad/J_A+A_618_A20/table9.dat",
     }
-    return np.genfromtxt(data_files[mission], float, "#",
-                         usecols=[0, 1, 2, 4, 5],
-                         names=["logg", "Teff", "Z", "a", "b"])
+    return cached_loadtxt(data_files[mission], _table_dtype(["logg", "Teff", "Z", "a", "b"]), "#",
+                          usecols=[0, 1, 2, 4, 5])
 
 @lru_cache
 def _pow2_ld_coeffs_table(mission: str="TESS") -> np.ndarray[float]:
@@ -94,6 +179,29 @@ def _pow2_ld_coeffs_table(mission: str="TESS") -> np.ndarray[float]:
         "Kepler":   [7, 13],        # 63-74 & 141-152
         #"CHEOPS":   [9, 15],        # 89-100 & 167-178
     }
-    return np.genfromtxt(data_file, float, "#",
-                         usecols=[0, 1, 2] + g_h_columns[mission],
-                         names=["logg", "Teff", "Z", "g", "h"])
+    return cached_loadtxt(data_file, _table_dtype(["logg", "Teff", "Z", "g", "h"]), "#",
+                          usecols=[0, 1, 2] + g_h_columns[mission])
+
+
+def _quad_ab_columns(mission: str="TESS") -> Tuple[np.ndarray[float], np.ndarray[float]]:
+    """
+    The a & b columns of the quad LD coefficients table, in the order of the data file rows.
+    """
+    table = _quad_ld_coeffs_table(mission)
+    return table["a"], table["b"]
+
+
+def _pow2_gh_columns(mission: str="TESS") -> Tuple[np.ndarray[float], np.ndarray[float]]:
+    """
+    The g & h columns of the power-2 LD coefficients table, in the order of the data file rows.
+    """
+    table = _pow2_ld_coeffs_table(mission)
+    return table["g"], table["h"]
+
+
+def _table_dtype(names: List[str]) -> np.dtype:
+    """
+    The structured dtype of a table of float columns with the passed names. We use loadtxt,
+    rather than genfromtxt, as its C parser is much faster but it doesn't take a names arg.
+    """
+    return np.dtype([(name, float) for name in names])
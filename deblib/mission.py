@@ -1,6 +1,6 @@
 """ Photometry missions. """
 # pylint: disable=no-name-in-module
-from typing import Union, Tuple
+from typing import Union, Tuple, Dict, Type, Iterable
 from inspect import getsourcefile
 from pathlib import Path
 from abc import ABC, abstractmethod
@@ -11,16 +11,28 @@ import numpy as np
 from uncertainties import UFloat
 from uncertainties.umath import fsum
 
-from .stellar import black_body_spectral_radiance
+from .stellar import black_body_spectral_radiance, black_body_spectral_radiance_batch
+from ._data_cache import cached_loadtxt
 
 class Mission(ABC):
     """ Base class for mission photemetric characteristics. """
+    # Missions are stateless (all of their data is held & cached at class level) so the
+    # instances need no per-instance __dict__.
+    __slots__ = ()
+
     COL_NAMES = ["lambda", "coefficient"]
+    COL_DTYPE = np.dtype([(name, float) for name in COL_NAMES])
 
     _this_dir = Path(getsourcefile(lambda:0)).parent
 
+    # Subclasses keyed on their lower case name; populated by __init_subclass__
+    _registry: Dict[str, Type["Mission"]] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        Mission._registry[cls.__name__.lower()] = cls
+
     @classmethod
-    @lru_cache
     def get_instance(cls, mission_name: str, **kwargs):
         """
         A factory method for getting an instance of a chosen Mission subclass.
@@ -31,10 +43,21 @@ class Mission(ABC):
         :kwargs: the arguments for the Mission's initializer
         :returns: a cached instance of the chosen Mission
         """
-        for subclass in cls.__subclasses__():
-            if mission_name.strip().lower() in subclass.__name__.lower():
-                return subclass(**kwargs)
-        raise KeyError(f"No Mission subclass named like {mission_name}")
+        # Normalize before the cached call so variations of a name share the same instance
+        return cls._get_instance(mission_name.strip().lower(), **kwargs)
+
+    @classmethod
+    @lru_cache
+    def _get_instance(cls, name: str, **kwargs):
+        """
+        The cached implementation of get_instance() which expects a normalized name.
+        """
+        # As with the original __subclasses__() search, matching is scoped to subclasses of cls
+        subclass = next((sub for key, sub in Mission._registry.items()
+                            if name in key and issubclass(sub, cls) and sub is not cls), None)
+        if subclass is not None:
+            return subclass(**kwargs)
+        raise KeyError(f"No Mission subclass named like {name}")
 
     @classmethod
     @abstractmethod
@@ -42,8 +65,39 @@ class Mission(ABC):
         """
         Get the mission's response function, wavelength against efficiency
 
+        :returns: structured array with lambda [nm] and coefficient columns in ascending
+        lambda order
+        """
+
+    @classmethod
+    def coefficient_at(cls, wavelength: float) -> float:
+        """
+        Gets the coefficient of the mission's response function at the passed wavelength.
+        Raises a KeyError if the response function has no value for this exact wavelength.
+
+        :wavelength: the wavelength in nm
+        :returns: the response coefficient
+        """
+        rf = cls.get_response_function()
+        ix = np.searchsorted(rf["lambda"], wavelength)
+        if ix < len(rf) and rf["lambda"][ix] == wavelength:
+            return float(rf["coefficient"][ix])
+        raise KeyError(f"No {cls.__name__} response coefficient at {wavelength} nm")
+
+    @classmethod
+    def slice_bandpass(cls, lambda_from: float, lambda_to: float) -> np.ndarray:
+        """
+        Gets the rows of the mission's response function within the requested bandpass.
+        As the response function is in ascending lambda order this is a view of it.
+
+        :lambda_from: the inclusive lower limit of the bandpass in nm
+        :lambda_to: the inclusive upper limit of the bandpass in nm
         :returns: structured array with lambda [nm] and coefficient columns
         """
+        rf = cls.get_response_function()
+        ix_from = np.searchsorted(rf["lambda"], lambda_from, side="left")
+        ix_to = np.searchsorted(rf["lambda"], lambda_to, side="right")
+        return rf[ix_from:ix_to]
 
     @classmethod
     def get_default_bandpass(cls) -> Tuple[float, float]:
@@ -75,18 +129,72 @@ class Mission(ABC):
         if bandpass is None:
             bandpass = cls.get_default_bandpass()
 
-        rf = cls.get_response_function()
-        mask = (rf["lambda"] >= min(bandpass)) & (rf["lambda"] <= max(bandpass))
-        bins = rf[mask]["lambda"]
-        coeffs = rf[mask]["coefficient"]
-
-        radiance_1 = fsum(coeffs * black_body_spectral_radiance(t_eff_1, bins))
-        radiance_2 = fsum(coeffs * black_body_spectral_radiance(t_eff_2, bins))
+        bins, coeffs = cls._get_bandpass_response(float(min(bandpass)), float(max(bandpass)))
+        if isinstance(t_eff_1, UFloat) or isinstance(t_eff_2, UFloat):
+            # fsum handles the UFloats, preserving correlations in the propagated errors
+            radiance_1 = fsum(coeffs * black_body_spectral_radiance(t_eff_1, bins))
+            radiance_2 = fsum(coeffs * black_body_spectral_radiance(t_eff_2, bins))
+        else:
+            # Both radiances in one pass, with the temperatures broadcast against the bins,
+            # so the temperature independent terms are only calculated once.
+            radiances = black_body_spectral_radiance_batch([t_eff_1, t_eff_2], bins)
+            # tolist() gives us floats, so the ratio is a float rather than an np.float64
+            radiance_1, radiance_2 = (radiances @ coeffs).tolist()
         return radiance_2 / radiance_1
 
+    @classmethod
+    def expected_brightness_ratio_batch(cls,
+                                        t_effs_1: Iterable[Union[float, UFloat]],
+                                        t_effs_2: Iterable[Union[float, UFloat]],
+                                        bandpass: Tuple[float, float] = None) \
+                                            -> np.ndarray[Union[float, UFloat]]:
+        """
+        Calculate the brightness ratios (J2/J1) of pairs of stars with the passed effective
+        temperatures over the requested bandpass making use of this mission's response function.
+        Equivalent to calling expected_brightness_ratio() for each pair, except that the
+        radiances of all the stars are calculated together in a single vectorized pass.
+
+        :t_effs_1: effective temperatures of the first stars in K
+        :t_effs_2: effective temperatures of the second stars in K
+        :bandpass: the range of wavelengths as [nm] to calculate over
+        or, if None, the result of get_default_bandpass() will be used
+        :returns: ndarray of the ratios of the secondary/primary brightness, in the broadcast
+        shape of t_effs_1 and t_effs_2
+        """
+        if bandpass is None:
+            bandpass = cls.get_default_bandpass()
+
+        bins, coeffs = cls._get_bandpass_response(float(min(bandpass)), float(max(bandpass)))
+        t_effs_1, t_effs_2 = np.broadcast_arrays(np.asarray(t_effs_1), np.asarray(t_effs_2))
+        count = t_effs_1.size
+        radiances = black_body_spectral_radiance_batch(
+                        np.concatenate([t_effs_1.reshape(-1), t_effs_2.reshape(-1)]), bins) @ coeffs
+        return (radiances[count:] / radiances[:count]).reshape(t_effs_1.shape)
+
+    @classmethod
+    @lru_cache(maxsize=32)
+    def _get_bandpass_response(cls, lambda_from: float, lambda_to: float) \
+                                -> Tuple[np.ndarray[float], np.ndarray[float]]:
+        """
+        Gets the wavelength bins & coefficients of the mission's response function which lie
+        within the requested bandpass. These are cached, as callers will usually use the same
+        bandpass, so are returned as read-only contiguous arrays.
+
+        :lambda_from: the inclusive lower limit of the bandpass in nm
+        :lambda_to: the inclusive upper limit of the bandpass in nm
+        :returns: tuple of (bins, coeffs) arrays
+        """
+        rf = cls.slice_bandpass(lambda_from, lambda_to)
+        bins = np.ascontiguousarray(rf["lambda"])
+        coeffs = np.ascontiguousarray(rf["coefficient"])
+        bins.flags.writeable = coeffs.flags.writeable = False
+        return bins, coeffs
+
 
 class Tess(Mission):
     """ Characteristics of the TESS mission. """
+    __slots__ = ()
+
     def __init__(self):
         pass
 
@@ -103,11 +211,13 @@ class Tess(Mission):
         :returns: structured array with lambda [nm] and coefficient columns
         """
         file = cls._this_dir / "data/missions/tess/tess-response-function-v2.0.csv"
-        return np.genfromtxt(file, float, "#", ",", skip_header=7, names=Mission.COL_NAMES)
+        return cached_loadtxt(file, Mission.COL_DTYPE, "#", ",", skiprows=7)
 
 
 class Kepler(Mission):
     """ Characteristics of the Kepler mission. """
+    __slots__ = ()
+
     def __init__(self):
         pass
 
@@ -124,4 +234,4 @@ class Kepler(Mission):
         :returns: structured array with lambda [nm] and coefficient columns
         """
         file = cls._this_dir / "data/missions/kepler/kepler_response_hires1.txt"
-        return np.genfromtxt(file, float, "#", skip_header=9, names=Mission.COL_NAMES)
+        return cached_loadtxt(file, Mission.COL_DTYPE, "#", skiprows=9)
@@ -1,16 +1,36 @@
 """ Utility functions for orbital relations. """
 # pylint: disable=no-name-in-module, no-member, too-many-arguments, too-many-positional-arguments
-from typing import Union
+from typing import Union, Tuple, List, Any
+from numbers import Number
 from math import pi
+import math
 
 import numpy as _np
 from uncertainties import UFloat
 
-from .vmath import sin, cos, arccos, arctan, radians, degrees
+from .vmath import sin, cos, arccos, arctan, radians, degrees, ufloat_from_derivatives
+from .vmath import _nominal_values as _nom
 from .constants import G
 
 FOUR_PI_SQUARED = 4*pi**2
 
+_DEG_TO_RAD = pi / 180
+_RAD_TO_DEG = 180 / pi
+
+# The sign applied to esinw in the (1 ± esinw) terms, keyed on whether it's the secondary eclipse
+_ECLIPSE_SIGN = { False: 1.0, True: -1.0 }
+
+# Fold G into the Kepler's 3rd law constant once, so each call has one fewer UFloat operation.
+# These are derived from G so they remain correlated with it for the purposes of error propagation.
+FOUR_PI_SQUARED_OVER_G = FOUR_PI_SQUARED / G
+G_OVER_FOUR_PI_SQUARED = G / FOUR_PI_SQUARED
+
+# The float equivalents used for the nominals in the analytic paths, which add G's uncertainty
+# through its partial derivative, so we don't look up or multiply out G.n on every call
+_G_N = G.nominal_value
+_FOUR_PI_SQUARED_OVER_G_N = FOUR_PI_SQUARED / _G_N
+_G_N_OVER_FOUR_PI_SQUARED = _G_N / FOUR_PI_SQUARED
+
 def orbital_period(m1: Union[float, UFloat, _np.ndarray[Union[float, UFloat]]],
                    m2: Union[float, UFloat, _np.ndarray[Union[float, UFloat]]],
                    a: Union[float, UFloat, _np.ndarray[Union[float, UFloat]]]) \
@@ -28,8 +48,20 @@ def orbital_period(m1: Union[float, UFloat, _np.ndarray[Union[float, UFloat]]],
     :a: the semi-major axis length in units of m
     :returns: the orbital period and uncertainty in units of s
     """
+    if _all_scalars_or_ndarrays(m1, m2, a):
+        # P = k * a^1.5 where k = sqrt(4π^2 / G(m1+m2)), so the partials are straight forward.
+        # Evaluated on the nominals in numpy, which works equally for scalars and ndarrays.
+        m_n, a_n = _nom(m1) + _nom(m2), _nom(a)
+        k = _np.sqrt(_FOUR_PI_SQUARED_OVER_G_N / m_n)
+        sqrt_a = _np.sqrt(a_n)
+        period = _float_if_scalar(k * a_n * sqrt_a)
+        return ufloat_from_derivatives(period, [(m1, -period / (2 * m_n)),
+                                                (m2, -period / (2 * m_n)),
+                                                (a, 1.5 * k * sqrt_a),
+                                                (G, -period / (2 * _G_N))])
+
     # We're not using any math/umath funcs here so this will "just work" with ndarrays
-    return (FOUR_PI_SQUARED * a**3 / (G * (m1 + m2)))**0.5
+    return (FOUR_PI_SQUARED_OVER_G * a*a*a / (m1 + m2))**0.5
 
 
 def semi_major_axis(m1: Union[float, UFloat, _np.ndarray[Union[float, UFloat]]],
@@ -49,8 +81,18 @@ def semi_major_axis(m1: Union[float, UFloat, _np.ndarray[Union[float, UFloat]]],
     :period: the components' orbital period in units of s
     :returns: the semi-major axis and uncertainty in units of m
     """
+    if _all_scalars_or_ndarrays(m1, m2, period):
+        # a = (G(m1+m2)P^2 / 4π^2)^(1/3), so each partial is a simple multiple of a.
+        # As above, evaluated on the nominals in numpy for both scalars and ndarrays.
+        m_n, p_n = _nom(m1) + _nom(m2), _nom(period)
+        a = _float_if_scalar(_np.cbrt(_G_N_OVER_FOUR_PI_SQUARED * m_n * p_n * p_n))
+        return ufloat_from_derivatives(a, [(m1, a / (3 * m_n)),
+                                           (m2, a / (3 * m_n)),
+                                           (period, 2 * a / (3 * p_n)),
+                                           (G, a / (3 * _G_N))])
+
     # We're not using any math/umath funcs here so this will "just work" with ndarrays
-    return (G * (m1 + m2) * period**2 / FOUR_PI_SQUARED)**(1/3)
+    return (G_OVER_FOUR_PI_SQUARED * (m1 + m2) * period*period)**(1/3)
 
 
 def impact_parameter(r1: Union[float, UFloat, _np.ndarray[Union[float, UFloat]]],
@@ -74,8 +116,81 @@ def impact_parameter(r1: Union[float, UFloat, _np.ndarray[Union[float, UFloat]]]
     # Primary eclipse:      (1/r1) * cos(inc) * (1-e^2 / 1+esinw)
     # Secondary eclipse:    (1/r1) * cos(inc) * (1-e^2 / 1-esinw)
     # Only difference is the final divisor so work the common dividend out
-    dividend = (1 / r1) * cos(radians(inc)) * (1 - e**2)
-    return dividend / (1-esinw if secondary else 1+esinw)
+    if _all_scalars_or_ndarrays(r1, inc, e, esinw):
+        # Evaluate once on the nominals, then propagate any uncertainties with the analytic partials
+        dividend, partials = _impact_parameter_dividend(r1, inc, e)
+        return _impact_parameter_from_dividend(dividend, partials, esinw, _eclipse_sign(secondary))
+
+    dividend = (1 / r1) * cos(radians(inc)) * ((1 - e) * (1 + e))
+    return dividend / (1 + _eclipse_sign(secondary) * esinw)
+
+
+def impact_parameters(r1: Union[float, UFloat, _np.ndarray[Union[float, UFloat]]],
+                      inc: Union[float, UFloat, _np.ndarray[Union[float, UFloat]]],
+                      e: Union[float, UFloat, _np.ndarray[Union[float, UFloat]]],
+                      esinw: Union[float, UFloat, _np.ndarray[Union[float, UFloat]]]) \
+                        -> Tuple[Union[float, UFloat, _np.ndarray[float], _np.ndarray[UFloat]],
+                                 Union[float, UFloat, _np.ndarray[float], _np.ndarray[UFloat]]]:
+    """
+    Calculate both the primary and secondary impact parameters using the primary
+    star's fractional radius, the orbital inclination and eccentricity, and the
+    e*sin(omega) Poincare element. This is cheaper than calling impact_parameter()
+    twice as the terms common to both are only evaluated once.
+
+    :r1: fractional radius of the primary star
+    :inc: the orbital inclination in degrees
+    :e: the orbital eccentricity
+    :esinw: the e*sin(omega) Poincare element
+    :returns: tuple of the (primary, secondary) impact parameters
+    """
+    if _all_scalars_or_ndarrays(r1, inc, e, esinw):
+        # As impact_parameter(), with the dividend and its partials shared by both eclipses
+        dividend, partials = _impact_parameter_dividend(r1, inc, e)
+        return _impact_parameter_from_dividend(dividend, partials, esinw, 1.0), \
+                _impact_parameter_from_dividend(dividend, partials, esinw, -1.0)
+
+    dividend = (1 / r1) * cos(radians(inc)) * ((1 - e) * (1 + e))
+    return dividend / (1+esinw), dividend / (1-esinw)
+
+
+def _impact_parameter_dividend(r1: Union[float, UFloat, _np.ndarray[Union[float, UFloat]]],
+                               inc: Union[float, UFloat, _np.ndarray[Union[float, UFloat]]],
+                               e: Union[float, UFloat, _np.ndarray[Union[float, UFloat]]]) \
+                                -> Tuple[Union[float, _np.ndarray[float]], List[Tuple[Any, Any]]]:
+    """
+    The nominal (1/r1) * cos(inc) * (1-e^2) term common to both primary & secondary impact params,
+    with its (arg, partial derivative) pairs for r1, inc & e if any of these has an uncertainty.
+    """
+    r1_n, inc_n, e_n = _nom(r1), _nom(inc) * _DEG_TO_RAD, _nom(e)
+    # The math funcs avoid numpy's scalar overheads where we have a single inclination
+    cos_inc = math.cos(inc_n) if isinstance(inc_n, float) else _np.cos(inc_n)
+    one_minus_e2_over_r1 = (1 - e_n) * (1 + e_n) / r1_n
+    dividend = cos_inc * one_minus_e2_over_r1
+    if not _any_ufloats(r1, inc, e):
+        return dividend, []
+
+    sin_inc = math.sin(inc_n) if isinstance(inc_n, float) else _np.sin(inc_n)
+    return dividend, [(r1, -dividend / r1_n),
+                      (inc, -sin_inc * one_minus_e2_over_r1 * _DEG_TO_RAD),
+                      (e, -2 * e_n * cos_inc / r1_n)]
+
+
+def _impact_parameter_from_dividend(dividend: Union[float, _np.ndarray[float]],
+                                    partials: List[Tuple[Any, Any]],
+                                    esinw: Union[float, UFloat, _np.ndarray[Union[float, UFloat]]],
+                                    sign: Union[float, _np.ndarray[float]]) \
+                                        -> Union[float, UFloat, _np.ndarray[Union[float, UFloat]]]:
+    """
+    Completes an impact parameter by dividing the nominal dividend, and its partials, by the
+    (1 ± esinw) divisor for the sign of the chosen eclipse (see _eclipse_sign()).
+    """
+    divisor = 1 + sign * _nom(esinw)
+    b = _float_if_scalar(dividend / divisor)
+    if not partials and not _any_ufloats(esinw):
+        return b
+
+    return ufloat_from_derivatives(b, [(arg, deriv / divisor) for arg, deriv in partials]
+                                        + [(esinw, -sign * b / divisor)])
 
 
 def orbital_inclination(r1: Union[float, UFloat, _np.ndarray[Union[float, UFloat]]],
@@ -98,8 +213,31 @@ def orbital_inclination(r1: Union[float, UFloat, _np.ndarray[Union[float, UFloat
     """
     # From primary eclipse/impact param:  i = arccos(bP * r1 * (1+esinw)/(1-e^2))
     # From secodary eclipse/impact param: i = arccos(bS * r1 * (1-esinw)/(1-e^2))
-    dividend = 1-esinw if secondary else 1+esinw
-    return degrees(arccos(b * r1 * dividend / (1 - e**2)))
+    if _all_scalars_or_ndarrays(r1, b, e, esinw):
+        # Evaluate arccos once on the nominals, then propagate any uncertainties by the chain rule
+        r1_n, b_n, e_n, esinw_n = _nom(r1), _nom(b), _nom(e), _nom(esinw)
+        inv_one_minus_e2 = 1 / ((1 - e_n) * (1 + e_n))
+        sign = _eclipse_sign(secondary)
+        dividend = 1 + sign * esinw_n
+        arg = b_n * r1_n * dividend * inv_one_minus_e2
+        # As above, though math.acos raises a ValueError outside [-1, 1] where arccos gives nan
+        if isinstance(arg, float) and -1 <= arg <= 1:
+            inc = math.acos(arg) * _RAD_TO_DEG
+        else:
+            inc = _float_if_scalar(_np.arccos(arg) * _RAD_TO_DEG)
+        if not _any_ufloats(r1, b, e, esinw):
+            return inc
+
+        # Reusing the common d(inc)/d(arg) / (1-e^2) factor of each partial
+        dinc_by_darg = -_RAD_TO_DEG / _np.sqrt((1 - arg) * (1 + arg)) * inv_one_minus_e2
+        return ufloat_from_derivatives(inc, [
+            (r1, dinc_by_darg * b_n * dividend),
+            (b, dinc_by_darg * r1_n * dividend),
+            (e, dinc_by_darg * 2 * e_n * arg),
+            (esinw, dinc_by_darg * sign * b_n * r1_n)])
+
+    dividend = 1 + _eclipse_sign(secondary) * esinw
+    return degrees(arccos(b * r1 * dividend / ((1 - e) * (1 + e))))
 
 
 def ratio_of_eclipse_duration(esinw: Union[float, UFloat, _np.ndarray[Union[float, UFloat]]]) \
@@ -127,6 +265,22 @@ def phase_of_secondary_eclipse(ecosw: Union[float, UFloat, _np.ndarray[Union[flo
     Uses eqn 5.67 and 5.68 from Hilditch, setting P=1 (normalized) & t_pri=0
     to give phi_sec = t_sec = (X-sinX)/2pi where X=pi+2*atan(ecosw/sqrt(1-e^2))
     """
+    if _all_scalars_or_ndarrays(ecosw, e):
+        # atan(y/s) == atan2(y, s) as s=sqrt(1-e^2) > 0, and atan2 avoids the division
+        ecosw_n, e_n = _nom(ecosw), _nom(e)
+        sqrt_one_minus_e2 = _np.sqrt((1 - e_n) * (1 + e_n))
+        x = pi + 2 * _np.arctan2(ecosw_n, sqrt_one_minus_e2)
+        phase = _float_if_scalar((x - _np.sin(x)) / (2 * pi))
+        if not _any_ufloats(ecosw, e):
+            return phase
+
+        # By the chain rule through d(phase)/dx = (1-cosX)/2pi
+        dphase_by_dx = (1 - _np.cos(x)) / (2 * pi)
+        h_squared = ecosw_n**2 + sqrt_one_minus_e2**2
+        return ufloat_from_derivatives(phase, [
+            (ecosw, dphase_by_dx * 2 * sqrt_one_minus_e2 / h_squared),
+            (e, dphase_by_dx * 2 * ecosw_n * e_n / (sqrt_one_minus_e2 * h_squared))])
+
     x = pi + 2*arctan(ecosw / (1 - e**2)**0.5)
     return (x - sin(x)) / (2 * pi)
 
@@ -183,3 +337,26 @@ def estimate_esinw(dp: Union[float, UFloat, _np.ndarray[Union[float, UFloat]]],
     :returns: the calculated value for esinw
     """
     return (ds - dp) / (ds + dp)
+
+
+def _eclipse_sign(secondary: Union[bool, _np.ndarray[bool]]) -> Union[float, _np.ndarray[float]]:
+    """ The sign of esinw in the (1 ± esinw) terms; -1 for the secondary & +1 for the primary. """
+    if _np.ndim(secondary) == 0:
+        return _ECLIPSE_SIGN[bool(secondary)]
+    return _np.where(secondary, -1.0, 1.0)
+
+
+def _float_if_scalar(x: Union[float, _np.ndarray[float]]) -> Union[float, _np.ndarray[float]]:
+    """ Converts a scalar/0-d numpy result to a float, so scalar args give float nominals. """
+    return float(x) if _np.ndim(x) == 0 else x
+
+
+def _all_scalars_or_ndarrays(*args) -> bool:
+    """ Whether all of the args are scalar numbers, UFloats or ndarrays (of either). """
+    return all(isinstance(arg, (Number, UFloat, _np.ndarray)) for arg in args)
+
+
+def _any_ufloats(*args) -> bool:
+    """ Whether any of the args are UFloats or ndarrays which may contain UFloats. """
+    return any(isinstance(arg, UFloat) or (isinstance(arg, _np.ndarray) and arg.dtype == object)
+               for arg in args)
@@ -1,11 +1,23 @@
 """ Utility functions for Stellar relations. """
-from typing import Union
+from typing import Union, Iterable
+from numbers import Number
 
 import numpy as np
 from uncertainties import UFloat
 
 from .constants import G, h, c, k_B
-from .vmath import log10, exp
+from .vmath import log10, ufloat_from_derivatives, _nominal_values as _nom
+
+# d(log10(x))/dx = log10(e)/x
+_LOG10_E = 1 / np.log(10)
+
+# Float constants for the nominal/vectorized paths; G's uncertainty is added via its partial
+_G_N = G.nominal_value
+_G_N_CGS = _G_N * 100
+
+# The temperature independent terms of the black body radiance calculation, for λ in nm
+_BB_PT1_DIVIDEND = 2e36 * h * c**2
+_BB_X_DIVIDEND = 1e9 * h * c / k_B
 
 def log_g(m: Union[float, UFloat, np.ndarray[Union[float, UFloat]]],
           r: Union[float, UFloat, np.ndarray[Union[float, UFloat]]]) \
@@ -21,13 +33,23 @@ def log_g(m: Union[float, UFloat, np.ndarray[Union[float, UFloat]]],
     :r: the stellar radius in units of m
     :returns: the log(g)) value and uncertainty
     """
+    if isinstance(m, (Number, UFloat, np.ndarray)) and isinstance(r, (Number, UFloat, np.ndarray)):
+        # Vectorized on the nominals, then uncertainties propagated with the analytic partials
+        # of log10(Gm/r^2) which preserves the correlations with G, m & r in the result
+        m_n, r_n = _nom(m), _nom(r)
+        logg = np.log10(_G_N_CGS * m_n / r_n**2)
+        return ufloat_from_derivatives(logg, [(G, _LOG10_E / _G_N),
+                                              (m, _LOG10_E / m_n),
+                                              (r, -2 * _LOG10_E / r_n)])
+
     # Starts in SI units of m/s^2 then to cgs units cm/s^2
     return log10((G * m / r**2) * 100)
 
 
-def black_body_spectral_radiance(temperature: Union[float, UFloat],
+def black_body_spectral_radiance(temperature: Union[float, UFloat,
+                                                    np.ndarray[Union[float, UFloat]]],
                                  lambdas: np.ndarray[float]) \
-                                    -> np.ndarray[UFloat]:
+                                    -> np.ndarray[Union[float, UFloat]]:
     """
     Calculates the blackbody spectral radiance at given wavelengths [nm] at
     the given temperature [K].
@@ -38,12 +60,51 @@ def black_body_spectral_radiance(temperature: Union[float, UFloat],
     
     where where λ [nm] = 10^9 c/v
 
-    :temperature: the temperature of the body in K
+    :temperature: the temperature of the body in K, or an ndarray of temperatures
+    which will be broadcast against lambdas (i.e. shape (#temps, 1) for a row per temperature;
+    see black_body_spectral_radiance_batch())
     :lambdas: the wavelength bins (in nm) at which of the radiation is to be calculated.
     :returns: NDArray of the calculated radiance for each bin, in units of W / (m^2 sr nm)
     """
     # This approach reproduces the results of the poc implementation which would
     # have included implicit support for lambda [nm] through the use of astropy units.
-    pt1 = (2e36 * h * c**2) / lambdas**5
-    pt2 = exp((1e9 * h * c) / (lambdas * k_B * temperature)) - 1
-    return pt1 / pt2
+    lambdas_squared = lambdas * lambdas
+    pt1 = _BB_PT1_DIVIDEND / (lambdas_squared * lambdas_squared * lambdas)
+    x_by_t = _BB_X_DIVIDEND / lambdas
+    if isinstance(temperature, UFloat) or \
+            (isinstance(temperature, np.ndarray) and temperature.dtype == UFloat.dtype):
+        # Vectorized on the nominal with the uncertainty propagated through the analytic
+        # derivative dB/dT = B * x/T^2 * exp(x/T)/(exp(x/T)-1), rather than per bin UFloat ops.
+        # As with the float path, expm1 gives us the (exp(x/T)-1) terms, and exp(x/T) = expm1 + 1
+        t_nom = _nom(temperature)
+        expm1_x = np.expm1(x_by_t / t_nom)
+        radiance = pt1 / expm1_x
+        return ufloat_from_derivatives(radiance,
+                                       [(temperature, radiance * x_by_t * (expm1_x + 1)
+                                                        / (t_nom**2 * expm1_x))])
+
+    # Vectorized in numpy; expm1 is also more accurate than exp()-1 for small args.
+    radiance = x_by_t / temperature
+    if isinstance(radiance, np.ndarray):
+        # Work in place on the new array from the division, rather than allocating temporaries
+        np.expm1(radiance, out=radiance)
+        return np.divide(pt1, radiance, out=radiance)
+    return pt1 / np.expm1(radiance)
+
+
+def black_body_spectral_radiance_batch(temperatures: Iterable[Union[float, UFloat]],
+                                       lambdas: np.ndarray[float]) \
+                                            -> np.ndarray[Union[float, UFloat]]:
+    """
+    Calculates the blackbody spectral radiance at the given wavelengths [nm] for each of
+    the given temperatures [K] in a single vectorized pass. See black_body_spectral_radiance().
+
+    :temperatures: the temperatures of the bodies in K
+    :lambdas: the wavelength bins (in nm) at which of the radiation is to be calculated.
+    :returns: NDArray of shape (#temperatures, #lambdas) with a row of radiances for each
+    temperature, in units of W / (m^2 sr nm)
+    """
+    temperatures = np.asarray(temperatures)
+    if temperatures.dtype != UFloat.dtype:
+        temperatures = temperatures.astype(float, copy=False)
+    return black_body_spectral_radiance(temperatures.reshape(-1, 1), lambdas)
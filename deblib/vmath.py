@@ -5,44 +5,71 @@ this package. What it does do, which uncertainties.umath does not, is to apply
 vectorised operations on input values made up of lists or numpy ndarrays.
 
 Also contains a wrap_func_for_uncertainties() func which can be used to use
-UFloats with a function which doesn't/cannot support UFloats natively.
+UFloats with a function which doesn't/cannot support UFloats natively, and a
+ufloat_from_derivatives() func for building a result directly from analytic derivatives.
 """
-from typing import Iterable, Callable, Any
-from itertools import chain
+from typing import Iterable, Callable, Any, Tuple, Union
+from numbers import Real
+import math
+from math import pi, log
 import numpy as np
 from uncertainties import unumpy, UFloat, ufloat, Variable, wrap
+from uncertainties.core import AffineScalarFunc, LinearCombination
+
+_RAD_TO_DEG = 180 / pi
+_DEG_TO_RAD = pi / 180
+_LOG10_E = 1 / log(10)
+
+# Where a func is defined for all finite floats we short circuit plain float args to the math
+# module, avoiding the dispatch & numpy scalar overheads. The others (i.e. arccos) would raise
+# a ValueError outside their domain, rather than returning nan, so they always use numpy.
+# Likewise, the trig funcs raise for ±inf so only finite args are short circuited for these.
+# We use type() so that subclasses (np.float64) and UFloats are excluded with one check.
+# pylint: disable=unidiomatic-typecheck
 
 def degrees(x):
     """ Convert angles from radians to degrees """
-    return __call_simple_func_with_unc(x, np.degrees, lambda _: np.degrees(1))
+    if type(x) is float:
+        return math.degrees(x)
+    return __call_simple_func_with_unc(x, np.degrees, _ddegrees_by_dx)
 
 def radians(x):
     """ Convert angles from degrees to radians """
-    return __call_simple_func_with_unc(x, np.radians, lambda _: np.radians(1))
+    if type(x) is float:
+        return math.radians(x)
+    return __call_simple_func_with_unc(x, np.radians, _dradians_by_dx)
 
 def sin(x):
     """ Calculate the sin value of x [rad] """
+    if type(x) is float and math.isfinite(x):
+        return math.sin(x)
     return __call_simple_func_with_unc(x, np.sin, np.cos)
 
 def cos(x):
     """ Calculate the cos value of x [rad] """
+    if type(x) is float and math.isfinite(x):
+        return math.cos(x)
     return __call_simple_func_with_unc(x, np.cos, np.sin)
 
 def tan(x):
     """ Calculate the tan value of x [rad] """
-    return __call_simple_func_with_unc(x, np.tan, lambda n: 1+np.tan(n)**2)
+    if type(x) is float and math.isfinite(x):
+        return math.tan(x)
+    return __call_simple_func_with_unc(x, np.tan, _dtan_by_dx)
 
 def arcsin(x):
     """ Calculate the inverse sin value of x """
-    return __call_simple_func_with_unc(x, np.arcsin, lambda n: 1/np.sqrt(1-n**2))
+    return __call_simple_func_with_unc(x, np.arcsin, _darcsin_by_dx)
 
 def arccos(x):
     """ Calculate the inverse cos value of x """
-    return __call_simple_func_with_unc(x, np.arccos, lambda n: -1/np.sqrt(1-n**2))
+    return __call_simple_func_with_unc(x, np.arccos, _darccos_by_dx)
 
 def arctan(x):
     """ Calculate the inverse tan value of x """
-    return __call_simple_func_with_unc(x, np.arctan, lambda n: 1/(1+n**2))
+    if type(x) is float:
+        return math.atan(x)
+    return __call_simple_func_with_unc(x, np.arctan, _darctan_by_dx)
 
 def exp(x):
     """ Calculate the exponential value of x """
@@ -50,7 +77,33 @@ def exp(x):
 
 def log10(x):
     """ Calculate the base 10 logarithm value of x """
-    return __call_simple_func_with_unc(x, np.log10, lambda n: 1/n/np.log(10))
+    return __call_simple_func_with_unc(x, np.log10, _dlog10_by_dx)
+
+
+# The derivatives of the above funcs which have no direct numpy equivalent. These are module
+# level funcs, rather than lambdas, so they're not recreated on each call.
+# pylint: disable=missing-function-docstring
+def _ddegrees_by_dx(_):
+    return _RAD_TO_DEG
+
+def _dradians_by_dx(_):
+    return _DEG_TO_RAD
+
+def _dtan_by_dx(n):
+    return 1 + np.tan(n)**2
+
+def _darcsin_by_dx(n):
+    return 1 / np.sqrt(1 - n**2)
+
+def _darccos_by_dx(n):
+    return -1 / np.sqrt(1 - n**2)
+
+def _darctan_by_dx(n):
+    return 1 / (1 + n**2)
+
+def _dlog10_by_dx(n):
+    return _LOG10_E / n
+# pylint: enable=missing-function-docstring
 
 
 def __call_simple_func_with_unc(x, f: Callable[[Any], Any], df_by_dx: Callable[[Any], Any]):
@@ -60,7 +113,7 @@ def __call_simple_func_with_unc(x, f: Callable[[Any], Any], df_by_dx: Callable[[
         f(x +/- Δx) = f(x) +/- f'(x)*Δx
 
     4 main scenarios;
-    - x is primitive (float, int, ...): the result is from numpy func, with no uncertainty
+    - x is primitive (float, int, ...): the result is a float from numpy func, with no uncertainty
     - x is list or array, all primitive: the result is from numpy func, with no uncertainties
     - x is UFloat: the result is a UFloat with nom from numpy func and unc from the derivative
     - x is list or array, some or all UFloats: result is array of all UFloats
@@ -72,18 +125,54 @@ def __call_simple_func_with_unc(x, f: Callable[[Any], Any], df_by_dx: Callable[[
     :df_by_dx: the derivative of func - must support x as an Iterable (ie: operators & numpy funcs)
     :returns: the result as described
     """
-    if isinstance(x, UFloat):
-        return ufloat(f(x.n), np.abs(df_by_dx(x.n) * x.s))
-
-    if isinstance(x, Iterable):
-        if (isinstance(x, np.ndarray) and x.dtype == UFloat.dtype) \
-                or next((True for i in chain(x) if isinstance(i, UFloat)), False):
-            noms = unumpy.nominal_values(x)
-            stds = unumpy.std_devs(x)
-            return unumpy.uarray(f(noms), np.abs(df_by_dx(noms) * stds))
+    # An ndarray can only hold UFloats if it's of object dtype, so numeric ndarrays (the most
+    # common case) go straight to f, and we only need to scan other Iterables for UFloats.
+    if isinstance(x, np.ndarray):
+        if x.dtype.kind != "O":
+            return f(x)
+        has_ufloats = True
+    elif isinstance(x, UFloat):
+        return ufloat(f(x.n), abs(df_by_dx(x.n) * x.s))
+    elif isinstance(x, Real):
+        # Other numeric scalars (i.e. int, np.float64) give a float, as the short circuits do
+        return float(f(x))
+    else:
+        has_ufloats = isinstance(x, Iterable) and any(isinstance(i, UFloat) for i in x)
+
+    if has_ufloats:
+        noms, stds = _nominal_values_and_std_devs(x)
+        # stds is a new array, so we can scale it in place into the output uncertainties
+        stds *= df_by_dx(noms)
+        return unumpy.uarray(f(noms), np.fabs(stds, out=stds))
 
     return f(x)
 
+def _nominal_values_and_std_devs(x: Iterable[Union[float, UFloat]]) \
+                                    -> Tuple[np.ndarray[float], np.ndarray[float]]:
+    """
+    Gets the nominal values and standard deviations of the items in x in a single pass, rather
+    than the two passes of unumpy.nominal_values() & std_devs(). Non-UFloat items are treated as
+    nominal values with zero standard deviation.
+    """
+    items = np.asarray(x, dtype=object)
+    noms, stds = np.empty(items.shape), np.zeros(items.shape)
+    noms_view, stds_view = noms.reshape(-1), stds.reshape(-1) # views, as both are new/contiguous
+    for ix, item in enumerate(items.flat):
+        if isinstance(item, UFloat):
+            noms_view[ix], stds_view[ix] = item.nominal_value, item.std_dev
+        else:
+            noms_view[ix] = item
+    return noms, stds
+
+def _nominal_values(x: Union[float, UFloat, np.ndarray[Union[float, UFloat]]]) \
+        -> Union[float, np.ndarray[float]]:
+    """ Gets the nominal value(s) of x, which may or may not be/contain UFloats. """
+    if isinstance(x, UFloat):
+        return x.nominal_value
+    if isinstance(x, np.ndarray) and x.dtype == object:
+        return unumpy.nominal_values(x)
+    return x
+
 def wrap_func_for_uncertainties(func: Callable, derivative_args=None, derivative_kwargs=None):
     """
     This creates a wrapper over a function which does not natively support uncertaintes & UFloats.
@@ -112,3 +201,46 @@ def wrap_func_for_uncertainties(func: Callable, derivative_args=None, derivative
                 kwargs[k].tag = k
         return ufloat_func(*args, **kwargs)
     return wrapped_func
+
+
+def ufloat_from_derivatives(nominal: Union[float, np.ndarray[float]],
+                            derivatives: Iterable[Tuple[Any, Union[float, np.ndarray[float]]]]) \
+                                -> Union[float, UFloat, np.ndarray[float], np.ndarray[UFloat]]:
+    """
+    Builds the result of a function directly from its nominal value and the analytic partial
+    derivatives with respect to each of its arguments. This avoids the overhead of evaluating
+    the function as a chain of UFloat operations, or of the numerical differentiation which
+    is used by the uncertainties wrap() func, while still preserving the correlations between
+    the result and any UFloat arguments.
+
+    If the nominal is an ndarray then the derivatives may be scalars or ndarrays which are
+    broadcast against it, and the result will be an ndarray of UFloats.
+
+    :nominal: the nominal value(s) of the function's result
+    :derivatives: pairs of (arg, df/darg) - any args which are not UFloats are ignored
+    :returns: UFloat(s) if any of the args is a UFloat, otherwise the nominal value(s)
+    """
+    # pylint: disable=protected-access
+    # This is how uncertainties.wrap() builds its result, from the args' linear parts
+    if np.ndim(nominal) == 0:
+        # A 0-d object ndarray (i.e. np.array(ufloat(...))) holds its UFloat as its only item
+        args = ((arg.item() if isinstance(arg, np.ndarray) and arg.dtype == object else arg, d)
+                for arg, d in derivatives)
+        linear_part = [(d, arg._linear_part) for arg, d in args if isinstance(arg, UFloat)]
+        return AffineScalarFunc(nominal, LinearCombination(linear_part)) if linear_part else nominal
+
+    # For ndarrays, UFloat args contribute to every element and ndarrays of UFloats elementwise
+    shape = np.shape(nominal)
+    terms = []
+    for arg, deriv in derivatives:
+        if isinstance(arg, UFloat) or (isinstance(arg, np.ndarray) and arg.dtype == object):
+            terms.append((np.broadcast_to(arg, shape), np.broadcast_to(deriv, shape)))
+    if not terms:
+        return nominal
+
+    result = np.empty(shape, dtype=object)
+    for ix, nom in np.ndenumerate(nominal):
+        linear_part = [(float(d[ix]), a[ix]._linear_part)
+                       for a, d in terms if isinstance(a[ix], UFloat)]
+        result[ix] = AffineScalarFunc(nom, LinearCombination(linear_part))
+    return result
@@ -0,0 +1,74 @@
+""" Unit tests for the _data_cache module. """
+import unittest
+import os
+from pathlib import Path
+from unittest.mock import patch
+from tempfile import TemporaryDirectory
+
+import numpy as np
+
+from deblib._data_cache import cached_loadtxt
+
+# pylint: disable=line-too-long
+class Testdatacache(unittest.TestCase):
+    """ Unit tests for the _data_cache module. """
+    _dtype = np.dtype([("x", float), ("y", float)])
+
+    def test_cached_loadtxt_matches_loadtxt(self):
+        """ Tests cached_loadtxt() gives the same result as loadtxt() on both the first & cached calls """
+        with TemporaryDirectory() as tmp_dir:
+            file = Path(tmp_dir) / "test.dat"
+            file.write_text("# x y z\n1.0 2.0 3.0\n4.0 5.0 6.0\n", encoding="utf8")
+            expected = np.loadtxt(file, self._dtype, "#", usecols=[0, 2])
+
+            for call in ["first", "cached"]:
+                actual = cached_loadtxt(file, self._dtype, "#", usecols=[0, 2])
+                self.assertTrue(np.array_equal(expected, actual), f"{call}: {actual} != {expected}")
+                self.assertFalse(actual.flags.writeable, f"{call}: expected a read-only array")
+            self.assertEqual(1, len(list(Path(tmp_dir).glob("test.dat.*.npy"))))
+
+    def test_cached_loadtxt_args_cached_separately(self):
+        """ Tests cached_loadtxt() caches different selections from the same file separately """
+        with TemporaryDirectory() as tmp_dir:
+            file = Path(tmp_dir) / "test.dat"
+            file.write_text("1.0 2.0 3.0\n4.0 5.0 6.0\n", encoding="utf8")
+
+            for usecols, exp_y in [([0, 1], [2.0, 5.0]), ([0, 2], [3.0, 6.0]), ([0, 1], [2.0, 5.0])]:
+                table = cached_loadtxt(file, self._dtype, usecols=usecols)
+                self.assertListEqual(exp_y, list(table["y"]))
+            self.assertEqual(2, len(list(Path(tmp_dir).glob("test.dat.*.npy"))))
+
+    def test_cached_loadtxt_failed_write_leaves_no_files(self):
+        """ Tests cached_loadtxt() still returns the data & leaves no temp file if the cache write fails """
+        with TemporaryDirectory() as tmp_dir:
+            file = Path(tmp_dir) / "test.dat"
+            file.write_text("1.0 2.0\n4.0 5.0\n", encoding="utf8")
+            with patch("deblib._data_cache.np.save", side_effect=OSError("disk full")):
+                table = cached_loadtxt(file, self._dtype)
+            self.assertListEqual([2.0, 5.0], list(table["y"]))
+            self.assertListEqual([file], list(Path(tmp_dir).iterdir()))
+
+    def test_cached_loadtxt_prunes_stale_caches(self):
+        """ Tests cached_loadtxt() deletes the caches & temp files older than the text file when it writes a cache """
+        with TemporaryDirectory() as tmp_dir:
+            file = Path(tmp_dir) / "test.dat"
+            file.write_text("1.0 2.0 3.0\n4.0 5.0 6.0\n", encoding="utf8")
+            cached_loadtxt(file, self._dtype, usecols=[0, 1])
+            leftover_tmp = Path(tmp_dir) / "test.dat.0123456789ab.npy.99999.tmp"
+            leftover_tmp.write_bytes(b"")
+            for stale_file in Path(tmp_dir).glob("test.dat.*"):
+                os.utime(stale_file, (1e9, 1e9))
+
+            # The text changes, so the caches above are stale; the one now written should be kept
+            file.write_text("1.0 2.0 3.0\n7.0 8.0 9.0\n", encoding="utf8")
+            table = cached_loadtxt(file, self._dtype, usecols=[0, 2])
+            self.assertListEqual([3.0, 9.0], list(table["y"]))
+            self.assertEqual(1, len(list(Path(tmp_dir).glob("test.dat.*.npy"))))
+            self.assertFalse(leftover_tmp.exists())
+
+            # Another selection of the same, current, text doesn't prune the current cache
+            cached_loadtxt(file, self._dtype, usecols=[0, 1])
+            self.assertEqual(2, len(list(Path(tmp_dir).glob("test.dat.*.npy"))))
+
+if __name__ == "__main__":
+    unittest.main()
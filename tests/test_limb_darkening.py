@@ -1,5 +1,6 @@
 """ Unit tests for the limb_darkening module. """
 import unittest
+import numpy as np
 
 from deblib import limb_darkening
 
@@ -34,7 +35,7 @@ class Testlimbdarkening(unittest.TestCase):
     #
     def test_lookup_quad_ld_coeffs_tess_basic(self):
         """ Tests lookup_quad_ld_coeffs(logg, t_eff, "TESS") """
-        reference_data = limb_darkening._quad_ld_coeffs_table("TESS")
+        a_col, b_col = limb_darkening._quad_ab_columns("TESS")
         for (logg,  t_eff,      exp_coeffs_line) in [
             # Test finding correct data in the range where logg steps are 0.5 and teff are 100 K
             (4.0,   6500.0,     self.quad_line_4_0_6500),
@@ -49,7 +50,7 @@ class Testlimbdarkening(unittest.TestCase):
             (4.0,   7299.0,     self.quad_line_4_0_7200),
 
             # There's a gap in the coeffs between Teff 4900 and 5100 K
-            # Test the case where we need to round away from 5000, otherwise we get a KeyError.
+            # Test the case where the nearest Teff is either side of the missing 5000 K rows.
             (4.81,  4956.7,     self.quad_line_5_0_4900),
             (5.24,  5021.3,     self.quad_line_5_0_5100),
 
@@ -60,14 +61,14 @@ class Testlimbdarkening(unittest.TestCase):
             (4.0,   2000.0,     self.quad_line_4_0_min),
             (4.0,   12600.0,    self.quad_line_4_0_max),
         ]:
-            exp_coeffs = tuple(reference_data[exp_coeffs_line - 1][["a", "b"]])
+            exp_coeffs = (a_col[exp_coeffs_line - 1], b_col[exp_coeffs_line - 1])
             coeffs = limb_darkening.lookup_quad_coefficients(logg, t_eff, "TESS")
             self.assertEqual(exp_coeffs, coeffs,
                              f"TESS quad coeffs {coeffs} mismatch data file ln {exp_coeffs_line}")
 
     def test_lookup_quad_ld_coeffs_kepler_basic(self):
         """ Tests lookup_quad_ld_coeffs(logg, t_eff, "Kepler") """
-        reference_data = limb_darkening._quad_ld_coeffs_table("Kepler")
+        a_col, b_col = limb_darkening._quad_ab_columns("Kepler")
         for (logg,  t_eff,      exp_coeffs_line) in [
             # Test finding correct data in the range where logg steps are 0.5 and teff are 100 K
             (4.0,   6500.0,     self.quad_line_4_0_6500),
@@ -82,7 +83,7 @@ class Testlimbdarkening(unittest.TestCase):
             (4.0,   7299.0,     self.quad_line_4_0_7200),
 
             # There's a gap in the coeffs between Teff 4900 and 5100 K
-            # Test the case where we need to round away from 5000, otherwise we get a KeyError.
+            # Test the case where the nearest Teff is either side of the missing 5000 K rows.
             (4.81,  4956.7,     self.quad_line_5_0_4900),
             (5.24,  5021.3,     self.quad_line_5_0_5100),
 
@@ -93,7 +94,7 @@ class Testlimbdarkening(unittest.TestCase):
             (4.0,   2000.0,     self.quad_line_4_0_min),
             (4.0,   12600.0,    self.quad_line_4_0_max),
         ]:
-            exp_coeffs = tuple(reference_data[exp_coeffs_line - 1][["a", "b"]])
+            exp_coeffs = (a_col[exp_coeffs_line - 1], b_col[exp_coeffs_line - 1])
             coeffs = limb_darkening.lookup_quad_coefficients(logg, t_eff, "Kepler")
             self.assertEqual(exp_coeffs, coeffs,
                              f"Kepler quad coeffs {coeffs} mismatch data file ln {exp_coeffs_line}")
@@ -104,7 +105,7 @@ class Testlimbdarkening(unittest.TestCase):
     #
     def test_lookup_pow2_ld_coeffs_tess_basic(self):
         """ Tests lookup_pow2_coefficients(logg, t_eff, "TESS") """
-        reference_data = limb_darkening._pow2_ld_coeffs_table("TESS")
+        g_col, h_col = limb_darkening._pow2_gh_columns("TESS")
         for (logg,  t_eff,      exp_coeffs_line) in [
             # Test finding correct data in the range where logg steps are 0.5 and teff are 100 K
             (4.0,   6500.0,     self.pow2_line_4_0_6500),
@@ -119,7 +120,7 @@ class Testlimbdarkening(unittest.TestCase):
             (4.0,   7299.0,     self.pow2_line_4_0_7200),
 
             # There's a gap in the coeffs between Teff 4900 and 5100 K
-            # Test the case where we need to round away from 5000, otherwise we get a KeyError.
+            # Test the case where the nearest Teff is either side of the missing 5000 K rows.
             (4.81,  4956.7,     self.pow2_line_5_0_4900),
             (5.24,  5021.3,     self.pow2_line_5_0_5100),
 
@@ -130,14 +131,14 @@ class Testlimbdarkening(unittest.TestCase):
             (4.0,   2000.0,     self.pow2_line_4_0_min),
             (4.0,   12600.0,    self.pow2_line_4_0_max),
         ]:
-            exp_coeffs = tuple(reference_data[exp_coeffs_line - 1][["g", "h"]])
+            exp_coeffs = (g_col[exp_coeffs_line - 1], h_col[exp_coeffs_line - 1])
             coeffs = limb_darkening.lookup_pow2_coefficients(logg, t_eff, "TESS")
             self.assertEqual(exp_coeffs, coeffs,
                              f"Kepler pow2 coeffs {coeffs} mismatch data file ln {exp_coeffs_line}")
 
     def test_lookup_pow2_ld_coeffs_kepler_basic(self):
         """ Tests lookup_pow2_coefficients(logg, t_eff, "Kepler") """
-        reference_data = limb_darkening._pow2_ld_coeffs_table("Kepler")
+        g_col, h_col = limb_darkening._pow2_gh_columns("Kepler")
         for (logg,  t_eff,      exp_coeffs_line) in [
             # Test finding correct data in the range where logg steps are 0.5 and teff are 100 K
             (4.0,   6500.0,     self.pow2_line_4_0_6500),
@@ -152,7 +153,7 @@ class Testlimbdarkening(unittest.TestCase):
             (4.0,   7299.0,     self.pow2_line_4_0_7200),
 
             # There's a gap in the coeffs between Teff 4900 and 5100 K
-            # Test the case where we need to round away from 5000, otherwise we get a KeyError.
+            # Test the case where the nearest Teff is either side of the missing 5000 K rows.
             (4.81,  4956.7,     self.pow2_line_5_0_4900),
             (5.24,  5021.3,     self.pow2_line_5_0_5100),
 
@@ -163,10 +164,48 @@ class Testlimbdarkening(unittest.TestCase):
             (4.0,   2000.0,     self.pow2_line_4_0_min),
             (4.0,   12600.0,    self.pow2_line_4_0_max),
         ]:
-            exp_coeffs = tuple(reference_data[exp_coeffs_line - 1][["g", "h"]])
+            exp_coeffs = (g_col[exp_coeffs_line - 1], h_col[exp_coeffs_line - 1])
             coeffs = limb_darkening.lookup_pow2_coefficients(logg, t_eff, "Kepler")
             self.assertEqual(exp_coeffs, coeffs,
                              f"Kepler pow2 coeffs {coeffs} mismatch data file ln {exp_coeffs_line}")
 
+    #
+    # Mission name handling common to lookup_quad_ld_coeffs() & lookup_pow2_coefficients()
+    #
+    def test_lookup_coeffs_mission_name_variations(self):
+        """ Tests the lookup functions match the mission name case insensitively """
+        for lookup_func in [limb_darkening.lookup_quad_coefficients, limb_darkening.lookup_pow2_coefficients]:
+            for (mission,       variations) in [
+                ("TESS",        ["tess", "Tess", " TESS "]),
+                ("Kepler",      ["kepler", "KEPLER", "Kepler  "]),
+            ]:
+                exp_coeffs = lookup_func(4.0, 6500, mission)
+                for variation in variations:
+                    with self.subTest(f"{lookup_func.__name__}(mission='{variation}')"):
+                        self.assertEqual(exp_coeffs, lookup_func(4.0, 6500, variation))
+
+    def test_lookup_coeffs_batch_matches_scalar(self):
+        """ Tests the lookup functions with ndarrays of logg/t_eff match the equivalent scalar lookups """
+        loggs = [0.0, 3.76, 4.0, 4.24, 4.81, 5.24, 6.5]
+        t_effs = [2000.0, 2300.0, 4956.7, 5021.3, 6450.1, 6549.9, 7100.1, 7299.0, 12000.0, 12600.0]
+        for lookup_func in [limb_darkening.lookup_quad_coefficients, limb_darkening.lookup_pow2_coefficients]:
+            for mission in ["TESS", "Kepler"]:
+                for (logg,                          t_eff) in [
+                    (np.array(loggs)[:, np.newaxis],  np.array(t_effs)),
+                    (np.array(loggs),               5021.3),
+                    (4.0,                           np.array(t_effs)),
+                ]:
+                    with self.subTest(f"{lookup_func.__name__}({type(logg)}, {type(t_eff)}, {mission})"):
+                        coeffs = lookup_func(logg, t_eff, mission)
+                        loggs_b, t_effs_b = np.broadcast_arrays(logg, t_eff)
+                        for ix in np.ndindex(loggs_b.shape):
+                            exp_coeffs = lookup_func(loggs_b[ix], t_effs_b[ix], mission)
+                            self.assertEqual(exp_coeffs, tuple(c[ix] for c in coeffs))
+
+    def test_lookup_coeffs_unknown_mission(self):
+        """ Tests the lookup functions raise a KeyError for an unknown mission """
+        for lookup_func in [limb_darkening.lookup_quad_coefficients, limb_darkening.lookup_pow2_coefficients]:
+            self.assertRaises(KeyError, lookup_func, 4.0, 6500, "CHEOPS")
+
 if __name__ == "__main__":
     unittest.main()
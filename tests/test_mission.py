@@ -1,5 +1,7 @@
 """ Unit tests for the Mission base class and sub classes. """
 import unittest
+import numpy as np
+from uncertainties import ufloat, UFloat
 
 from deblib.mission import Mission, Tess, Kepler
 
@@ -26,39 +28,66 @@ class TestMission(unittest.TestCase):
             mission = Mission.get_instance(mission_name)
             self.assertIsInstance(mission, mission_type)
 
+    def test_mission_get_instance_scoped_to_class(self):
+        """ Tests the get_instance() function only matches subclasses of the class it's called on. """
+        self.assertIsInstance(Mission.get_instance("TES"), Tess)
+        self.assertIsInstance(Mission.get_instance("kep"), Kepler)
+        self.assertRaises(KeyError, Tess.get_instance, "kepler")
+        self.assertRaises(KeyError, Kepler.get_instance, "tess")
+
     def test_mission_get_instance_assert_caching(self):
         """ Tests the Mission get_instance() to assert caching of instances """
         # Currently uses a simple lru_cache decorator
         # so it's dependent on consistent naming
         instance1 = Mission.get_instance("Tess")
         instance2 = Mission.get_instance("Tess")
-        self.assertEqual(instance1, instance2)
+        self.assertIs(instance1, instance2)
+        self.assertFalse(hasattr(instance1, "__dict__"))
+
+    def test_mission_get_instance_name_variations_share_instance(self):
+        """ Tests the Mission get_instance() returns the same instance for variations of a name """
+        for variations in [["Tess", "tess", "TESS ", " tEsS"], ["Kepler", "KEPLER  ", "kepler"]]:
+            instance = Mission.get_instance(variations[0])
+            for variation in variations[1:]:
+                self.assertIs(instance, Mission.get_instance(variation), f"{variation}")
 
 
     #
     # Tests base/sub-class get_response_function()
     #
-    def test_tess_get_response_function(self):
-        """ Tests the TESS get_response_function(). """
-        rf = Tess.get_response_function()
-        self.assertIsNotNone(rf)
-        self.assertEqual(rf[rf["lambda"]==800]["coefficient"], 0.777)
-        self.assertEqual(len(rf[(rf["lambda"]>=600) & (rf["lambda"]<=1000)]), 201)
-
-    def test_kepler_get_response_function(self):
-        """ Tests the Kepler get_response_function(). """
-        rf = Kepler.get_response_function()
-        self.assertIsNotNone(rf)
-        self.assertEqual(rf[rf["lambda"]==500]["coefficient"], 6.239e-1)
-        self.assertEqual(len(rf[(rf["lambda"]>=400) & (rf["lambda"]<=900)]), 501)
+    def test_mission_subclass_get_response_function(self):
+        """ Tests the TESS & Kepler get_response_function() against known values. """
+        for (mission,   lambda_at,  exp_coeff,  lambda_from,    lambda_to,  exp_rows) in [
+            (Tess,      800,        0.777,      600,            1000,       201),
+            (Kepler,    500,        6.239e-1,   400,            900,        501),
+        ]:
+            with self.subTest(mission.__name__):
+                self.assertIsNotNone(mission.get_response_function())
+                self.assertEqual(mission.coefficient_at(lambda_at), exp_coeff)
+                self.assertEqual(len(mission.slice_bandpass(lambda_from, lambda_to)), exp_rows)
 
     def test_mission_get_response_function(self):
         """ Tests polymorphic use of Mission get_response_function(). """
         for (mission, exp_coeff) in zip([Tess, Kepler],
                                         [0.768, 0.6159]):
+            self.assertIsNotNone(mission.get_response_function())
+            self.assertEqual(mission.coefficient_at(700), exp_coeff)
+
+    def test_mission_coefficient_at_unknown_wavelength(self):
+        """ Tests Mission subclass coefficient_at() raises a KeyError outside/between the response function's lambdas """
+        for mission in self._all_missions:
+            for wavelength in [10, 700.5, 5000]:
+                with self.subTest(f"{mission.__name__}.coefficient_at({wavelength})"):
+                    self.assertRaises(KeyError, mission.coefficient_at, wavelength)
+
+    def test_mission_slice_bandpass(self):
+        """ Tests Mission subclass slice_bandpass() matches the equivalent boolean mask of the response function """
+        for mission in self._all_missions:
             rf = mission.get_response_function()
-            self.assertIsNotNone(rf)
-            self.assertEqual(rf[rf["lambda"]==700]["coefficient"], exp_coeff)
+            for (lambda_from,   lambda_to) in [(600, 1000), (420.5, 900.5), (0, 10000), (700, 700), (800, 700)]:
+                with self.subTest(f"{mission.__name__}.slice_bandpass({lambda_from}, {lambda_to})"):
+                    exp_rf = rf[(rf["lambda"] >= lambda_from) & (rf["lambda"] <= lambda_to)]
+                    self.assertTrue(np.array_equal(exp_rf, mission.slice_bandpass(lambda_from, lambda_to)))
 
     def test_mission_get_response_function_response_caching(self):
         """ Tests Mission subclass get_response_function() response caching. """
@@ -67,6 +96,12 @@ class TestMission(unittest.TestCase):
             rf2 = mission.get_response_function()
             self.assertTrue(rf2 is rf1, f"{mission} failed test of rf2 is rf1")
 
+    def test_mission_get_response_function_ascending_lambda(self):
+        """ Tests Mission subclass get_response_function() is ordered on lambda (for bandpass slicing). """
+        for mission in self._all_missions:
+            rf = mission.get_response_function()
+            self.assertTrue(all(rf["lambda"][1:] > rf["lambda"][:-1]), f"{mission} lambda not ascending")
+
 
     #
     # Tests default_bandpass -> (u.nm, u.nm)
@@ -86,15 +121,68 @@ class TestMission(unittest.TestCase):
     def test_expected_expected_brightness_ratio_known_systems(self):
         """ Tests that expected_brightness_ratio(known dEBs) gives an appropriate result """
         bandpass = Tess.get_default_bandpass()
-        for (target,        t_eff_1,    t_eff_2,    exp_ratio,  round_dp) in [
+        targets, t_effs_1, t_effs_2, exp_ratios, round_dps = zip(*[
             ("CW Eri",      6839,       6561,       0.9262,     1), # OverallSouthworth24obsR17
             ("V1022 Cas",   6450,       6590,       1.0391,     1), # Southworth21obsR3
             ("psi Cen",     10450,      8800,       0.688,      1), # BrunttSouthworth+06aa
             ("V454 Aur",    5890,       6170,       1.2059,     1), # Southworth24obsR19
-        ]:
-            ratio = Tess.expected_brightness_ratio(t_eff_1, t_eff_2, bandpass)
-            print(f"{target}: calculated ratio is {ratio:.4f}, expected is {exp_ratio:.4f}")
-            self.assertAlmostEqual(ratio, exp_ratio, round_dp, f"{target}: calculated {ratio:.4f}!~{exp_ratio:.4f}")
+        ])
+        # All of the targets' ratios in one call, sharing the same bandpass response
+        batch_ratios = Tess.expected_brightness_ratio_batch(t_effs_1, t_effs_2, bandpass)
+        for target, t_eff_1, t_eff_2, batch_ratio, exp_ratio, round_dp in \
+                zip(targets, t_effs_1, t_effs_2, batch_ratios, exp_ratios, round_dps):
+            # Also directly via the scalar float & UFloat (fsum) paths
+            for (path,      ratio) in [
+                ("batch",   batch_ratio),
+                ("float",   Tess.expected_brightness_ratio(t_eff_1, t_eff_2, bandpass)),
+                ("UFloat",  Tess.expected_brightness_ratio(ufloat(t_eff_1, 50), ufloat(t_eff_2, 50), bandpass).n),
+            ]:
+                with self.subTest(f"{target} ({path})"):
+                    self.assertAlmostEqual(ratio, exp_ratio, round_dp, f"{target}: calculated {ratio:.4f}!~{exp_ratio:.4f}")
+
+    def test_expected_brightness_ratio_float_t_effs(self):
+        """ Tests that expected_brightness_ratio(numeric scalars) returns a float """
+        for mission in self._all_missions:
+            for t_eff_1, t_eff_2 in [(5000., 4000.), (5000, 4000), (np.float64(5000), np.int64(4000))]:
+                with self.subTest(f"{mission.__name__}({t_eff_1!r}, {t_eff_2!r})"):
+                    self.assertIs(type(mission.expected_brightness_ratio(t_eff_1, t_eff_2)), float)
+
+    def test_expected_brightness_ratio_ufloat_t_effs(self):
+        """ Tests that expected_brightness_ratio(UFloats) propagates the uncertainties of both t_effs """
+        t_eff_1, t_eff_2 = ufloat(5000, 100), ufloat(4000, 50)
+        for mission in self._all_missions:
+            ratio = mission.expected_brightness_ratio(t_eff_1, t_eff_2)
+            self.assertAlmostEqual(mission.expected_brightness_ratio(t_eff_1.n, t_eff_2.n), ratio.n, 12)
+            # Compare with the std_dev from numerical differentiation
+            d_by_dt1 = mission.expected_brightness_ratio(t_eff_1.n + 0.5, t_eff_2.n) \
+                        - mission.expected_brightness_ratio(t_eff_1.n - 0.5, t_eff_2.n)
+            d_by_dt2 = mission.expected_brightness_ratio(t_eff_1.n, t_eff_2.n + 0.5) \
+                        - mission.expected_brightness_ratio(t_eff_1.n, t_eff_2.n - 0.5)
+            exp_std = ((d_by_dt1 * t_eff_1.s)**2 + (d_by_dt2 * t_eff_2.s)**2)**0.5
+            self.assertAlmostEqual(exp_std, ratio.s, delta=exp_std * 1e-4)
+
+    #
+    # Tests expected_brightness_ratio_batch(t_effs_1, t_effs_2, bandpass)
+    #
+    def test_expected_brightness_ratio_batch_matches_single(self):
+        """ Tests that expected_brightness_ratio_batch() matches expected_brightness_ratio() for each pair """
+        for mission in self._all_missions:
+            for (t_effs_1,                              t_effs_2,                               bandpass) in [
+                ([6839, 6450, 10450, 5890],             [6561, 6590, 8800, 6170],               None),
+                (np.array([5000., 6000.]),              4000.,                                  (600, 800)),
+                ([ufloat(5000, 100), 6000],             [ufloat(4000, 50), ufloat(4500, 20)],   None),
+            ]:
+                with self.subTest(f"{mission.__name__}({t_effs_1}, {t_effs_2}, {bandpass})"):
+                    ratios = mission.expected_brightness_ratio_batch(t_effs_1, t_effs_2, bandpass)
+                    t_effs_1, t_effs_2 = np.broadcast_arrays(np.asarray(t_effs_1), np.asarray(t_effs_2))
+                    self.assertEqual(t_effs_1.shape, ratios.shape)
+                    for t_eff_1, t_eff_2, ratio in zip(t_effs_1, t_effs_2, ratios):
+                        expected = mission.expected_brightness_ratio(t_eff_1, t_eff_2, bandpass)
+                        if isinstance(expected, UFloat):
+                            self.assertAlmostEqual(expected.n, ratio.n, 12)
+                            self.assertAlmostEqual(expected.s, ratio.s, 12)
+                        else:
+                            self.assertAlmostEqual(expected, ratio, 12)
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,28 +1,48 @@
 """ Unit tests for the orbital module. """
 import unittest
 import numpy as np
-import astropy.units as u
-from uncertainties import ufloat, UFloat
+from uncertainties import ufloat, UFloat, unumpy
 from uncertainties.unumpy import uarray
 
 from deblib.orbital import orbital_period, semi_major_axis
-from deblib.orbital import impact_parameter, orbital_inclination
+from deblib.orbital import impact_parameter, impact_parameters, orbital_inclination
 from deblib.orbital import ratio_of_eclipse_duration, phase_of_secondary_eclipse
 from deblib.orbital import eclipse_duration, estimate_ecosw, estimate_esinw
+from deblib.constants import G
 
-# Fiducial units to SI
-# pylint: disable=no-name-in-module, no-member
-M_EARTH = (1 * u.earthMass).to(u.kg).value
-M_SOL = (1 * u.solMass).to(u.kg).value
-R_SOL = (1 * u.solRad).to(u.m).value
-AU = (1 * u.au).to(u.m).value
-YEAR = (1 * u.yr).to(u.s).value
+# Fiducial units to SI, as given by astropy's u.earthMass, u.solMass, u.solRad, u.au & u.yr
+M_EARTH = 5.972167867791379e24  # kg
+M_SOL = 1.988409870698051e30    # kg
+R_SOL = 6.957e8                 # m
+AU = 1.495978707e11             # m
+YEAR = 3.15576e7                # s (Julian year)
 
 
 class Testorbital(unittest.TestCase):
     """ Unit tests for the orbital module. """
     # pylint: disable=too-many-public-methods, line-too-long
 
+    @classmethod
+    def setUpClass(cls):
+        """ Builds the 9 element ndarray & uarray args shared by the impact parameter/inclination tests. """
+        cls.np_r1, cls.np_0, cls.np_90 = np.full(9, R_SOL/AU), np.zeros(9), np.full(9, 90.)
+        cls.u_r1, cls.u_0, cls.u_90 = uarray(cls.np_r1, 0), uarray(cls.np_0, 0), uarray(cls.np_90, 0)
+
+    def test_fiducial_unit_constants_match_astropy(self):
+        """ Assert the literal fiducial unit constants agree with astropy's conversions """
+        # pylint: disable=import-outside-toplevel, no-name-in-module, no-member
+        # Imported here so astropy.units is only loaded by this test
+        import astropy.units as u
+        for (name,      actual,     exp_quantity) in [
+            ("M_EARTH", M_EARTH,    (1 * u.earthMass).to(u.kg)),
+            ("M_SOL",   M_SOL,      (1 * u.solMass).to(u.kg)),
+            ("R_SOL",   R_SOL,      (1 * u.solRad).to(u.m)),
+            ("AU",      AU,         (1 * u.au).to(u.m)),
+            ("YEAR",    YEAR,       (1 * u.yr).to(u.s)),
+        ]:
+            with self.subTest(name):
+                self.assertAlmostEqual(exp_quantity.value, actual, delta=exp_quantity.value * 1e-12)
+
     #
     # Test orbital_period(m1, m2, a) -> period
     #
@@ -31,13 +51,20 @@ class Testorbital(unittest.TestCase):
         for (m1,                    m2,                         a,                  exp_period) in [
             (M_SOL,                 M_EARTH,                    AU,                 365.256),
             (ufloat(M_SOL, 0),      ufloat(M_EARTH, 0),         ufloat(AU, 0),      365.256),
-            (np.array([M_SOL]*10),  np.array([M_EARTH]*10),     np.array([AU]*10),  np.array([365.256]*10)),
-            (uarray([M_SOL]*10, 0), uarray([M_EARTH]*10, 0),    uarray([AU]*10, 0), np.array([365.256]*10)),
+            (np.full(10, M_SOL),    np.full(10, M_EARTH),       np.full(10, AU),    np.full(10, 365.256)),
+            (uarray([M_SOL]*10, 0), uarray([M_EARTH]*10, 0),    uarray([AU]*10, 0), np.full(10, 365.256)),
         ]:
-            period = orbital_period(m1, m2, a) / 86400
-            for expected, actual in zip(exp_period if isinstance(exp_period, np.ndarray) else np.array([exp_period]),
-                                        period if isinstance(period, np.ndarray) else np.array([period])):
-                self.assertAlmostEqual(expected, actual.nominal_value, 2)
+            with self.subTest(f"{type(m1).__name__}[{np.asarray(m1).dtype}]"):
+                period = orbital_period(m1, m2, a) / 86400
+                np.testing.assert_allclose(unumpy.nominal_values(np.atleast_1d(period)), exp_period, rtol=0, atol=0.005)
+
+    def test_orbital_period_matches_kepler_3rd_law(self):
+        """ Assert orbital_period() nominal & std_dev match a direct evaluation of Kepler's 3rd law """
+        m1, m2, a = ufloat(2.0*M_SOL, 0.01*M_SOL), ufloat(1.5*M_SOL, 0.01*M_SOL), ufloat(0.2*AU, 0.001*AU)
+        exp_period = (4*np.pi**2 * a**3 / (G * (m1 + m2)))**0.5
+        period = orbital_period(m1, m2, a)
+        self.assertAlmostEqual(exp_period.n, period.n, delta=exp_period.n*1e-12)
+        self.assertAlmostEqual(exp_period.s, period.s, delta=exp_period.s*1e-9)
 
     #
     # Test semi_major_axis(m1, m2, period) -> a
@@ -47,13 +74,43 @@ class Testorbital(unittest.TestCase):
         for (m1,                    m2,                         period,                 exp_a) in [
             (M_SOL,                 M_EARTH,                    YEAR,                   1),
             (ufloat(M_SOL, 0),      ufloat(M_EARTH, 0),         ufloat(YEAR, 0),        1),
-            (np.array([M_SOL]*10),  np.array([M_EARTH]*10),     np.array([YEAR]*10),    np.array([1]*10)),
-            (uarray([M_SOL]*10, 0), uarray([M_EARTH]*10, 0),    uarray([YEAR]*10, 0),   np.array([1]*10)),
+            (np.full(10, M_SOL),    np.full(10, M_EARTH),       np.full(10, YEAR),      np.full(10, 1)),
+            (uarray([M_SOL]*10, 0), uarray([M_EARTH]*10, 0),    uarray([YEAR]*10, 0),   np.full(10, 1)),
+        ]:
+            with self.subTest(f"{type(m1).__name__}[{np.asarray(m1).dtype}]"):
+                a = semi_major_axis(m1, m2, period) / AU
+                np.testing.assert_allclose(unumpy.nominal_values(np.atleast_1d(a)), exp_a, rtol=0, atol=5e-05)
+
+    def test_semi_major_axis_matches_kepler_3rd_law(self):
+        """ Assert semi_major_axis() nominal & std_dev match a direct evaluation of Kepler's 3rd law """
+        m1, m2, period = ufloat(2.0*M_SOL, 0.01*M_SOL), ufloat(1.5*M_SOL, 0.01*M_SOL), ufloat(YEAR, 100)
+        exp_a = (G * (m1 + m2) * period**2 / (4*np.pi**2))**(1/3)
+        a = semi_major_axis(m1, m2, period)
+        self.assertAlmostEqual(exp_a.n, a.n, delta=exp_a.n*1e-12)
+        self.assertAlmostEqual(exp_a.s, a.s, delta=exp_a.s*1e-9)
+
+    def test_orbital_period_semi_major_axis_ndarray_matches_scalar(self):
+        """ Assert the vectorized ndarray[float|UFloat] results match those of the equivalent scalar calls """
+        for (m1,                                m2,                                 a) in [
+            (np.array([M_SOL, 2*M_SOL]),        np.array([M_EARTH, M_SOL]),         np.array([AU, 0.1*AU])),
+            (uarray([M_SOL, 2*M_SOL], 1e28),    uarray([M_EARTH, M_SOL], 1e28),     uarray([AU, 0.1*AU], 1e8)),
         ]:
-            a = semi_major_axis(m1, m2, period) / AU
-            for expected, actual in zip(exp_a if isinstance(exp_a, np.ndarray) else np.array([exp_a]),
-                                        a if isinstance(a, np.ndarray) else np.array([a])):
-                self.assertAlmostEqual(expected, actual.nominal_value, 4)
+            with self.subTest(f"{m1.dtype}"):
+                periods = orbital_period(m1, m2, a)
+                smas = semi_major_axis(m1, m2, periods)
+                for ix in range(len(m1)):
+                    exp_period = orbital_period(m1[ix], m2[ix], a[ix])
+                    for (exp, act) in [(exp_period, periods[ix]),
+                                       (semi_major_axis(m1[ix], m2[ix], exp_period), smas[ix])]:
+                        self.assertAlmostEqual(exp.n, act.n, delta=exp.n*1e-12)
+                        self.assertAlmostEqual(exp.s, act.s, delta=exp.s*1e-9 + 1e-6)
+
+    def test_orbital_period_semi_major_axis_round_trip_correlations(self):
+        """ Assert correlations are preserved so that semi_major_axis(orbital_period(a)) gives back a """
+        m1, m2, a = ufloat(2.0*M_SOL, 0.01*M_SOL), ufloat(1.5*M_SOL, 0.01*M_SOL), ufloat(0.2*AU, 0.001*AU)
+        a_rt = semi_major_axis(m1, m2, orbital_period(m1, m2, a))
+        self.assertAlmostEqual(a.n, a_rt.n, delta=a.n*1e-12)
+        self.assertAlmostEqual(a.s, a_rt.s, delta=a.s*1e-9)
 
     #
     # Tests impact_parameter(rA, inc, e, esinw, secondary:bool=False) -> b
@@ -65,16 +122,90 @@ class Testorbital(unittest.TestCase):
             (R_SOL/AU,                  90,                 0,                  0,                  True,       0.),
             (ufloat(R_SOL/AU, 0),       ufloat(90, 0),      ufloat(0, 0),       ufloat(0, 0),       False,      0.),
             (ufloat(R_SOL/AU, 0),       ufloat(90, 0),      ufloat(0, 0),       ufloat(0, 0),       True,       0.),
-            (np.array([R_SOL/AU]*9),    np.array([90]*9),   np.array([0]*9),    np.array([0]*9),    False,      np.array([0.])),
-            (np.array([R_SOL/AU]*9),    np.array([90]*9),   np.array([0]*9),    np.array([0]*9),    True,       np.array([0.])),
-            (uarray([R_SOL/AU]*9, 0),   uarray([90]*9, 0),  uarray([0]*9, 0),   uarray([0]*9, 0),   False,      np.array([0.])),
-            (uarray([R_SOL/AU]*9, 0),   uarray([90]*9, 0),  uarray([0]*9, 0),   uarray([0]*9, 0),   True,       np.array([0.])),
+            (self.np_r1,                self.np_90,         self.np_0,          self.np_0,          False,      np.full(9, 0.)),
+            (self.np_r1,                self.np_90,         self.np_0,          self.np_0,          True,       np.full(9, 0.)),
+            (self.u_r1,                 self.u_90,          self.u_0,           self.u_0,           False,      np.full(9, 0.)),
+            (self.u_r1,                 self.u_90,          self.u_0,           self.u_0,           True,       np.full(9, 0.)),
+        ]:
+            with self.subTest(f"{type(r1).__name__}[{np.asarray(r1).dtype}], secondary={secondary}"):
+                b = impact_parameter(r1, inc, e, esinw, secondary)
+                np.testing.assert_allclose(unumpy.nominal_values(np.atleast_1d(b)), exp_b, rtol=0, atol=5e-13)
+
+    def test_impact_parameter_orbital_inclination_ndarray_secondary(self):
+        """ Assert an ndarray of secondary flags gives the same results as the equivalent scalar calls """
+        secondary = np.array([False, True, True, False])
+        for (r1,                                e,                                      esinw) in [
+            (np.array([0.1, 0.1, 0.2, 0.2]),    np.array([0.2, 0.2, 0.1, 0.]),          np.array([0.15, 0.15, -0.05, 0.])),
+            (uarray([0.1, 0.1, 0.2, 0.2], 1e-3), uarray([0.2, 0.2, 0.1, 0.], 1e-2),     uarray([0.15, 0.15, -0.05, 0.], 1e-2)),
+        ]:
+            with self.subTest(f"{r1.dtype}"):
+                inc = np.array([88.5, 88.5, 86., 87.])
+                bs = impact_parameter(r1, inc, e, esinw, secondary)
+                incs = orbital_inclination(r1, bs, e, esinw, secondary)
+                for ix, sec in enumerate(secondary):
+                    exp_b = impact_parameter(r1[ix], inc[ix], e[ix], esinw[ix], bool(sec))
+                    exp_inc = orbital_inclination(r1[ix], exp_b, e[ix], esinw[ix], bool(sec))
+                    for (exp, act) in [(exp_b, bs[ix]), (exp_inc, incs[ix])]:
+                        if isinstance(exp, UFloat):
+                            self.assertAlmostEqual(exp.n, act.n, 12)
+                            self.assertAlmostEqual(exp.s, act.s, 12)
+                        else:
+                            self.assertAlmostEqual(exp, act, 12)
+
+    def test_scalar_args_give_floats(self):
+        """ Assert scalar (non-UFloat) args give float results, rather than numpy scalars """
+        for (func,                          args) in [
+            (impact_parameter,              (0.1, 88.5, 0.2, 0.15)),
+            (impact_parameter,              (np.float64(0.1), 88, 0, 0, True)),
+            (orbital_inclination,           (0.1, 0.3, 0.2, 0.15)),
+            (orbital_inclination,           (0.1, 30., 0.2, 0.15)),     # out of domain gives nan
+            (phase_of_secondary_eclipse,    (0.1, 0.2)),
+            (eclipse_duration,              (1, 0.2, 88)),
+        ]:
+            with self.subTest(f"{func.__name__}{args}"), np.errstate(invalid="ignore"):
+                self.assertIs(type(func(*args)), float)
+        for b in impact_parameters(0.1, 88.5, 0.2, 0.15):
+            self.assertIs(type(b), float)
+
+    #
+    # Tests impact_parameters(rA, inc, e, esinw) -> (bP, bS)
+    #
+    def test_impact_parameters_matches_impact_parameter(self):
+        """ Assert impact_parameters() gives the same results as the primary & secondary impact_parameter() """
+        for (r1,                        inc,                    e,                      esinw) in [
+            (0.1,                       88.5,                   0.2,                    0.15),
+            (ufloat(0.1, 0.001),        ufloat(88.5, 0.05),     ufloat(0.2, 0.01),      ufloat(0.15, 0.01)),
+            (np.array([0.1, 0.2]),      np.array([88.5, 86]),   np.array([0.2, 0.]),    np.array([0.15, 0.])),
         ]:
-            b = impact_parameter(r1, inc, e, esinw, secondary)
-            for expected, actual in zip(exp_b if isinstance(exp_b, np.ndarray) else np.array([exp_b]),
-                                        b if isinstance(b, np.ndarray) else np.array([b])):
-                actual_nom = actual.nominal_value if isinstance(actual, UFloat) else actual
-                self.assertAlmostEqual(expected, actual_nom, 12)
+            with self.subTest(f"{type(r1)}"):
+                b_pri, b_sec = impact_parameters(r1, inc, e, esinw)
+                for (exp_b, b) in [(impact_parameter(r1, inc, e, esinw, False), b_pri),
+                                   (impact_parameter(r1, inc, e, esinw, True), b_sec)]:
+                    for expected, actual in zip(np.atleast_1d(exp_b), np.atleast_1d(b)):
+                        if isinstance(expected, UFloat):
+                            self.assertAlmostEqual(expected.n, actual.n, 12)
+                            self.assertAlmostEqual(expected.s, actual.s, 12)
+                        else:
+                            self.assertAlmostEqual(expected, actual, 12)
+
+    def test_impact_parameters_propagation_matches_impact_parameter(self):
+        """ Assert impact_parameters() keeps the same correlations with its args as impact_parameter() """
+        for (r1,                            inc,                            e,                              esinw) in [
+            (ufloat(0.1, 0.001),            ufloat(88.5, 0.05),             ufloat(0.2, 0.01),              ufloat(0.15, 0.01)),
+            (ufloat(0.1, 0.001),            88.5,                           0.2,                            ufloat(-0.05, 0.01)),
+            (uarray([0.1, 0.2], 1e-3),      uarray([88.5, 86.], 0.05),      uarray([0.2, 0.1], 1e-2),       uarray([0.15, -0.05], 1e-2)),
+        ]:
+            with self.subTest(f"{type(r1).__name__}, {type(inc).__name__}"):
+                b_pri, b_sec = impact_parameters(r1, inc, e, esinw)
+                for (exp_b, b) in [(impact_parameter(r1, inc, e, esinw, False), b_pri),
+                                   (impact_parameter(r1, inc, e, esinw, True), b_sec)]:
+                    for expected, actual in zip(np.atleast_1d(exp_b), np.atleast_1d(b)):
+                        self.assertAlmostEqual(expected.s, actual.s, 12)
+                        for arg in np.concatenate([np.atleast_1d(a) for a in (r1, inc, e, esinw)]):
+                            if isinstance(arg, UFloat):
+                                self.assertAlmostEqual(expected.derivatives.get(arg, 0),
+                                                       actual.derivatives.get(arg, 0), 12)
+                        self.assertEqual(expected.derivatives.keys(), actual.derivatives.keys())
 
     #
     # Test orbital_inclination(r1, b, e, esinw, secondary:bool=False) -> i
@@ -86,17 +217,26 @@ class Testorbital(unittest.TestCase):
             (R_SOL/AU,                  0,                  0,                  0,                  True,       90.),
             (ufloat(R_SOL/AU, 0),       ufloat(0, 0),       ufloat(0, 0),       ufloat(0, 0),       False,      90.),
             (ufloat(R_SOL/AU, 0),       ufloat(0, 0),       ufloat(0, 0),       ufloat(0, 0),       True,       90.),
-            (np.array([R_SOL/AU]*9),    np.array([0]*9),    np.array([0]*9),    np.array([0]*9),    False,      np.array([90.])),
-            (np.array([R_SOL/AU]*9),    np.array([0]*9),    np.array([0]*9),    np.array([0]*9),    True,       np.array([90.])),
-            (uarray([R_SOL/AU]*9, 0),   uarray([0]*9, 0),   uarray([0]*9, 0),   uarray([0]*9, 0),   False,      np.array([90.])),
-            (uarray([R_SOL/AU]*9, 0),   uarray([0]*9, 0),   uarray([0]*9, 0),   uarray([0]*9, 0),   True,       np.array([90.])),
+            (self.np_r1,                self.np_0,          self.np_0,          self.np_0,          False,      np.full(9, 90.)),
+            (self.np_r1,                self.np_0,          self.np_0,          self.np_0,          True,       np.full(9, 90.)),
+            (self.u_r1,                 self.u_0,           self.u_0,           self.u_0,           False,      np.full(9, 90.)),
+            (self.u_r1,                 self.u_0,           self.u_0,           self.u_0,           True,       np.full(9, 90.)),
         ]:
-            inc = orbital_inclination(r1, b, e, esinw, secondary)
-            for expected, actual in zip(exp_inc if isinstance(exp_inc, np.ndarray) else np.array([exp_inc]),
-                                        inc if isinstance(inc, np.ndarray) else np.array([inc])):
-                actual_nom = actual.nominal_value if isinstance(actual, UFloat) else actual
-                self.assertEqual(expected, actual_nom)
+            with self.subTest(f"{type(r1).__name__}[{np.asarray(r1).dtype}], secondary={secondary}"):
+                inc = orbital_inclination(r1, b, e, esinw, secondary)
+                np.testing.assert_array_equal(unumpy.nominal_values(np.atleast_1d(inc)), exp_inc)
+
 
+    def test_orbital_inclination_impact_parameter_round_trip(self):
+        """ Assert correlations are preserved so that orbital_inclination(impact_parameter(inc)) gives back inc """
+        r1, inc, e, esinw = ufloat(0.1, 0.002), ufloat(88.5, 0.1), ufloat(0.2, 0.01), ufloat(0.15, 0.01)
+        for secondary in [False, True]:
+            with self.subTest(f"secondary={secondary}"):
+                b = impact_parameter(r1, inc, e, esinw, secondary)
+                inc_rt = orbital_inclination(r1, b, e, esinw, secondary)
+                self.assertAlmostEqual(inc.n, inc_rt.n, 9)
+                self.assertAlmostEqual(inc.s, inc_rt.s, 9)
+                self.assertAlmostEqual(0, (inc_rt - inc).s, 9)
 
     #
     # Test ratio_of_eclipse_duration(esinw) -> ~dS/sP
@@ -106,14 +246,12 @@ class Testorbital(unittest.TestCase):
         for (esinw,              exp_dur) in [
             (0,                  1.),
             (ufloat(0, 0),       1.),
-            (np.array([0]*9),    np.array([1.])),
-            (uarray([0]*9, 0),   np.array([1.])),
+            (np.full(9, 0),      np.full(9, 1.)),
+            (uarray([0]*9, 0),   np.full(9, 1.)),
         ]:
-            dur = ratio_of_eclipse_duration(esinw)
-            for expected, actual in zip(exp_dur if isinstance(exp_dur, np.ndarray) else np.array([exp_dur]),
-                                        dur if isinstance(dur, np.ndarray) else np.array([dur])):
-                actual_nom = actual.nominal_value if isinstance(actual, UFloat) else actual
-                self.assertEqual(expected, actual_nom)
+            with self.subTest(f"{type(esinw).__name__}[{np.asarray(esinw).dtype}]"):
+                dur = ratio_of_eclipse_duration(esinw)
+                np.testing.assert_array_equal(unumpy.nominal_values(np.atleast_1d(dur)), exp_dur)
 
 
     #
@@ -124,14 +262,31 @@ class Testorbital(unittest.TestCase):
         for (ecosw,              e,                 exp_phis) in [
             (0,                  0,                 0.5),
             (ufloat(0, 0),       ufloat(0, 0),      0.5),
-            (np.array([0]*9),    np.array([0]*9),   np.array([0.5])),
-            (uarray([0]*9, 0),   uarray([0]*9, 0),  np.array([0.5])),
+            (np.full(9, 0),      np.full(9, 0),     np.full(9, 0.5)),
+            (uarray([0]*9, 0),   uarray([0]*9, 0),  np.full(9, 0.5)),
         ]:
-            phis = phase_of_secondary_eclipse(ecosw, e)
-            for expected, actual in zip(exp_phis if isinstance(exp_phis, np.ndarray) else np.array([exp_phis]),
-                                        phis if isinstance(phis, np.ndarray) else np.array([phis])):
-                actual_nom = actual.nominal_value if isinstance(actual, UFloat) else actual
-                self.assertEqual(expected, actual_nom)
+            with self.subTest(f"{type(ecosw).__name__}[{np.asarray(ecosw).dtype}]"):
+                phis = phase_of_secondary_eclipse(ecosw, e)
+                np.testing.assert_array_equal(unumpy.nominal_values(np.atleast_1d(phis)), exp_phis)
+
+    def test_phase_of_secondary_eclipse_propagation(self):
+        """ Tests phase_of_secondary_eclipse() uncertainties against numerical differentiation """
+        for (ecosw,                 e) in [
+            (ufloat(0.1, 0.01),     ufloat(0.3, 0.02)),
+            (ufloat(-0.05, 0.002),  ufloat(0.8, 0.01)),
+            (ufloat(0.02, 0.001),   0.05),
+        ]:
+            with self.subTest(f"ecosw={ecosw}, e={e}"):
+                ecosw_n, e_n = ecosw.n, e.n if isinstance(e, UFloat) else e
+                phis = phase_of_secondary_eclipse(ecosw, e)
+                self.assertAlmostEqual(phase_of_secondary_eclipse(ecosw_n, e_n), phis.n, 12)
+                d_by_decosw = (phase_of_secondary_eclipse(ecosw_n + 1e-6, e_n)
+                               - phase_of_secondary_eclipse(ecosw_n - 1e-6, e_n)) / 2e-6
+                self.assertAlmostEqual(d_by_decosw, phis.derivatives[ecosw], 6)
+                if isinstance(e, UFloat):
+                    d_by_de = (phase_of_secondary_eclipse(ecosw_n, e_n + 1e-6)
+                               - phase_of_secondary_eclipse(ecosw_n, e_n - 1e-6)) / 2e-6
+                    self.assertAlmostEqual(d_by_de, phis.derivatives[e], 6)
 
 
     #
@@ -149,13 +304,13 @@ class Testorbital(unittest.TestCase):
                                                 ufloat(0.177, 0.001),
                                                         False,  ufloat(0.619, 0.007),
                                                                             "AI Phe primary with ufloats"),
-            (np.array([24.5924]*3),
-                        np.array([0.099]*3),
-                                np.array([88.359]*3),
-                                        np.array([0.188]*3),
-                                                np.array([0.177]*3),
+            (np.full(3, 24.5924),
+                        np.full(3, 0.099),
+                                np.full(3, 88.359),
+                                        np.full(3, 0.188),
+                                                np.full(3, 0.177),
                                                         False,
-                                                                np.array([0.619]*3),
+                                                                np.full(3, 0.619),
                                                                             "AI Phe primary with ndarray[floats]"),
             (uarray([24.5924]*3, 0.0010),
                         uarray([0.099]*3, 0.001),
@@ -168,15 +323,9 @@ class Testorbital(unittest.TestCase):
         ]:
             with self.subTest(msg):
                 dur = eclipse_duration(per, sum_r, inc, e, esinw, sec)
-                for expected, actual in zip(exp_dur if isinstance(exp_dur, np.ndarray) else np.array([exp_dur]),
-                                            dur if isinstance(dur, np.ndarray) else np.array([dur])):
-                    actual_nom = actual.n if isinstance(actual, UFloat) else actual
-                    expected_nom = expected.n if isinstance(expected, UFloat) else expected
-                    self.assertAlmostEqual(expected_nom, actual_nom, 3)
-
-                    actual_std = actual.s if isinstance(actual, UFloat) else 0
-                    expected_std = expected.s if isinstance(expected, UFloat) else 0
-                    self.assertAlmostEqual(expected_std, actual_std, 3)
+                expected, actual = np.atleast_1d(exp_dur), np.atleast_1d(dur)
+                np.testing.assert_allclose(unumpy.nominal_values(actual), unumpy.nominal_values(expected), rtol=0, atol=0.0005)
+                np.testing.assert_allclose(unumpy.std_devs(actual), unumpy.std_devs(expected), rtol=0, atol=0.0005)
 
 
     #
@@ -204,15 +353,9 @@ class Testorbital(unittest.TestCase):
                 else:
                     ecosw = estimate_ecosw(phis)
 
-                for expected, actual in zip(exp_ecosw if isinstance(exp_ecosw, np.ndarray) else np.array([exp_ecosw]),
-                                            ecosw if isinstance(ecosw, np.ndarray) else np.array([ecosw])):
-                    actual_nom = actual.n if isinstance(actual, UFloat) else actual
-                    expected_nom = expected.n if isinstance(expected, UFloat) else expected
-                    self.assertAlmostEqual(expected_nom, actual_nom, 3)
-
-                    actual_std = actual.s if isinstance(actual, UFloat) else 0
-                    expected_std = expected.s if isinstance(expected, UFloat) else 0
-                    self.assertAlmostEqual(expected_std, actual_std, 3)
+                expected, actual = np.atleast_1d(exp_ecosw), np.atleast_1d(ecosw)
+                np.testing.assert_allclose(unumpy.nominal_values(actual), unumpy.nominal_values(expected), rtol=0, atol=0.0005)
+                np.testing.assert_allclose(unumpy.std_devs(actual), unumpy.std_devs(expected), rtol=0, atol=0.0005)
 
 
     #
@@ -232,16 +375,31 @@ class Testorbital(unittest.TestCase):
             with self.subTest(msg):
                 esinw = estimate_esinw(durp, durs)
 
-                for expected, actual in zip(exp_esinw if isinstance(exp_esinw, np.ndarray) else np.array([exp_esinw]),
-                                            esinw if isinstance(esinw, np.ndarray) else np.array([esinw])):
-                    actual_nom = actual.n if isinstance(actual, UFloat) else actual
-                    expected_nom = expected.n if isinstance(expected, UFloat) else expected
-                    self.assertAlmostEqual(expected_nom, actual_nom, 3)
+                expected, actual = np.atleast_1d(exp_esinw), np.atleast_1d(esinw)
+                np.testing.assert_allclose(unumpy.nominal_values(actual), unumpy.nominal_values(expected), rtol=0, atol=0.0005)
+                np.testing.assert_allclose(unumpy.std_devs(actual), unumpy.std_devs(expected), rtol=0, atol=0.0005)
 
-                    actual_std = actual.s if isinstance(actual, UFloat) else 0
-                    expected_std = expected.s if isinstance(expected, UFloat) else 0
-                    self.assertAlmostEqual(expected_std, actual_std, 3)
 
+    #
+    # Tests the analytic paths with 0-d ndarray[UFloat] args
+    #
+    def test_0d_uarray_args_match_ufloat_args(self):
+        """ Assert 0-d ndarray[UFloat] args give the same uncertainties as the equivalent UFloat args """
+        m1, m2, a, period = ufloat(2.0*M_SOL, 0.01*M_SOL), ufloat(1.5*M_SOL, 0.01*M_SOL), ufloat(0.2*AU, 0.001*AU), ufloat(YEAR, 100)
+        r1, inc, b, e, esinw, ecosw = ufloat(0.1, 0.002), ufloat(88.5, 0.1), ufloat(0.3, 0.01), ufloat(0.2, 0.01), ufloat(0.15, 0.01), ufloat(0.1, 0.01)
+        for (func,                          args) in [
+            (orbital_period,                (m1, m2, a)),
+            (semi_major_axis,               (m1, m2, period)),
+            (impact_parameter,              (r1, inc, e, esinw)),
+            (orbital_inclination,           (r1, b, e, esinw)),
+            (phase_of_secondary_eclipse,    (ecosw, e)),
+        ]:
+            with self.subTest(func.__name__):
+                expected = func(*args)
+                actual = func(*(np.array(arg) for arg in args))
+                self.assertIsInstance(actual, UFloat)
+                self.assertAlmostEqual(expected.n, actual.n, delta=abs(expected.n) * 1e-12)
+                self.assertAlmostEqual(expected.s, actual.s, delta=expected.s * 1e-9)
 
 
 if __name__ == "__main__":
@@ -1,9 +1,10 @@
 """ Unit tests for the stellar module. """
 import unittest
 import numpy as np
+from uncertainties import ufloat, UFloat, unumpy
 
-from deblib.stellar import log_g
-from deblib.constants import M_sun, R_sun
+from deblib.stellar import log_g, black_body_spectral_radiance, black_body_spectral_radiance_batch
+from deblib.constants import G, M_sun, R_sun
 
 class Teststellar(unittest.TestCase):
     """ Unit tests for the stellar module. """
@@ -18,13 +19,94 @@ class Teststellar(unittest.TestCase):
             # M_SUN and R_SUN are already UFloats
             (M_sun.nominal_value,               R_sun.nominal_value,                4.4),
             (M_sun,                             R_sun,                              4.4),
-            (np.array([M_sun.nominal_value]*9), np.array([R_sun.nominal_value]*9),  np.array([4.4]*9)),
-            (np.array([M_sun]*9),               np.array([R_sun]*9),                np.array([4.4]*9)),
+            (np.full(9, M_sun.nominal_value),   np.full(9, R_sun.nominal_value),    np.full(9, 4.4)),
+            (np.array([M_sun]*9),               np.array([R_sun]*9),                np.full(9, 4.4)),
         ]:
             logg = log_g(m, r)
-            for expected, actual in zip(exp_logg if isinstance(exp_logg, np.ndarray) else np.array([exp_logg]),
-                                    logg if isinstance(logg, np.ndarray) else np.array([logg])):
-                self.assertAlmostEqual(expected, actual.nominal_value, 1)
+            np.testing.assert_allclose(unumpy.nominal_values(np.atleast_1d(logg)), exp_logg, rtol=0, atol=0.05)
+
+    def test_log_g_propagation_and_correlations(self):
+        """ Tests log_g() uncertainties match those from UFloat arithmetic & correlations are preserved """
+        for (m,                                     r) in [
+            (M_sun,                                 R_sun),
+            (M_sun.nominal_value,                   R_sun),
+            (np.array([M_sun, M_sun * 2]),          np.array([R_sun, R_sun * 1.5])),
+        ]:
+            with self.subTest(f"{type(m)}, {type(r)}"):
+                logg = log_g(m, r)
+                for exp_g, actual in zip(np.atleast_1d((G * m / r**2) * 100), np.atleast_1d(logg)):
+                    self.assertAlmostEqual(np.log10(exp_g.n), actual.n, 12)
+                    self.assertAlmostEqual(exp_g.s / (exp_g.n * np.log(10)), actual.s, 12)
+                # Should be fully correlated with itself
+                self.assertTrue(np.all(unumpy.std_devs(np.atleast_1d(logg - log_g(m, r))) == 0))
+
+    #
+    # Test black_body_spectral_radiance(temperature, lambdas)
+    #
+    def test_black_body_spectral_radiance_temperatures_broadcast(self):
+        """ Tests black_body_spectral_radiance() with an ndarray of temperatures broadcast against lambdas """
+        lambdas = np.arange(600, 1001, 50, dtype=float)
+        temperatures = np.array([[3500.], [5772.], [10000.]])
+        radiances = black_body_spectral_radiance(temperatures, lambdas)
+        self.assertEqual((3, len(lambdas)), radiances.shape)
+        for temperature, exp_radiance in zip(temperatures[:, 0], radiances):
+            radiance = black_body_spectral_radiance(temperature, lambdas)
+            self.assertTrue(np.allclose(exp_radiance, radiance, rtol=1e-12, atol=0))
+
+    def test_black_body_spectral_radiance_ufloat_temperature(self):
+        """ Tests black_body_spectral_radiance() with a UFloat temperature against numerical differentiation """
+        lambdas = np.arange(600, 1001, 50, dtype=float)
+        temperature = ufloat(5772, 50)
+        radiance = black_body_spectral_radiance(temperature, lambdas)
+        exp_noms = black_body_spectral_radiance(temperature.n, lambdas)
+        exp_stds = (black_body_spectral_radiance(temperature.n + 0.5, lambdas)
+                    - black_body_spectral_radiance(temperature.n - 0.5, lambdas)) * temperature.s
+        for exp_nom, exp_std, actual in zip(exp_noms, exp_stds, radiance):
+            self.assertIsInstance(actual, UFloat)
+            self.assertAlmostEqual(exp_nom, actual.n, delta=exp_nom * 1e-12)
+            self.assertAlmostEqual(exp_std, actual.s, delta=exp_std * 1e-6)
+            # The result remains correlated with the input temperature
+            self.assertAlmostEqual(exp_std / temperature.s, actual.derivatives[temperature], delta=exp_std * 1e-6)
+
+    #
+    # Test black_body_spectral_radiance_batch(temperatures, lambdas)
+    #
+    def test_black_body_spectral_radiance_batch_matches_single(self):
+        """ Tests black_body_spectral_radiance_batch() gives a row matching black_body_spectral_radiance() per temperature """
+        lambdas = np.arange(600, 1001, 50, dtype=float)
+        for temperatures in [
+            [3500, 5772, 10000],
+            np.array([3500., 5772., 10000.]),
+            [ufloat(3500, 100), ufloat(5772, 50), ufloat(10000, 300)],
+        ]:
+            with self.subTest(f"{type(temperatures)}[{type(temperatures[0])}]"):
+                radiances = black_body_spectral_radiance_batch(temperatures, lambdas)
+                self.assertEqual((len(temperatures), len(lambdas)), radiances.shape)
+                for temperature, row in zip(temperatures, radiances):
+                    for expected, actual in zip(black_body_spectral_radiance(temperature, lambdas), row):
+                        if isinstance(expected, UFloat):
+                            self.assertAlmostEqual(expected.n, actual.n, delta=expected.n * 1e-12)
+                            self.assertAlmostEqual(expected.s, actual.s, delta=expected.s * 1e-12)
+                            self.assertAlmostEqual(expected.derivatives[temperature],
+                                                   actual.derivatives[temperature], delta=expected.s * 1e-12)
+                        else:
+                            self.assertAlmostEqual(expected, actual, delta=expected * 1e-12)
+    #
+    # Tests the analytic paths with 0-d ndarray[UFloat] args
+    #
+    def test_0d_uarray_args_match_ufloat_args(self):
+        """ Tests log_g() & black_body_spectral_radiance() give the same uncertainties for 0-d ndarray[UFloat] args as UFloats """
+        lambdas = np.arange(600, 1001, 50, dtype=float)
+        for (func,                          args) in [
+            (log_g,                         (M_sun, R_sun)),
+            (black_body_spectral_radiance,  (ufloat(5772, 50), lambdas)),
+        ]:
+            with self.subTest(func.__name__):
+                expected = np.atleast_1d(func(*args))
+                actual = np.atleast_1d(func(*(np.array(arg) if isinstance(arg, UFloat) else arg for arg in args)))
+                self.assertTrue(all(isinstance(a, UFloat) for a in actual))
+                np.testing.assert_allclose(unumpy.nominal_values(actual), unumpy.nominal_values(expected), rtol=1e-12)
+                np.testing.assert_allclose(unumpy.std_devs(actual), unumpy.std_devs(expected), rtol=1e-9)
 
 if __name__ == "__main__":
     unittest.main()
@@ -5,12 +5,21 @@ import unittest
 import numpy as np
 
 # pylint: disable=no-member
-from uncertainties import ufloat, UFloat, umath
+from uncertainties import ufloat, UFloat, umath, unumpy
 
 from deblib import vmath
 
+# The numpy & umath reference funcs for each vmath func, allowing for where numpy & umath/math
+# use different func names
+_UMATH_NAMES = { "arcsin": "asin", "arccos": "acos", "arctan": "atan" }
+_REFERENCE_FUNCS = {
+    name: (getattr(np, name), getattr(umath, _UMATH_NAMES.get(name, name)))
+        for name in ["degrees", "radians", "sin", "cos", "tan",
+                     "arcsin", "arccos", "arctan", "exp", "log10"]
+}
+
 class Testvmath(unittest.TestCase):
-    """ Unit tests for the stellar module. """
+    """ Unit tests for the vmath module. """
     # pylint: disable=too-many-public-methods, line-too-long
 
     def test_degrees_calculations(self):
@@ -33,16 +42,31 @@ class Testvmath(unittest.TestCase):
         """ Basic suite of tests for the tan function calculations """
         self.__test_calcs(vmath.tan, [(0, 0), (1, 0), (0.12, 0.01), (-0.18, 0.1)])
 
+    def test_trig_non_finite_floats(self):
+        """ Tests sin(), cos() & tan() give nan, rather than raising, for non-finite floats as numpy does """
+        for vmath_func in [vmath.sin, vmath.cos, vmath.tan]:
+            for x in [float("inf"), float("-inf"), float("nan")]:
+                with self.subTest(f"vmath.{vmath_func.__name__}({x})"), np.errstate(invalid="ignore"):
+                    self.assertTrue(np.isnan(vmath_func(x)))
+
+    def test_numeric_scalars_give_floats(self):
+        """ Tests each func returns a float, rather than a numpy scalar, for any numeric scalar arg """
+        for func_name in _REFERENCE_FUNCS:
+            vmath_func = getattr(vmath, func_name)
+            for x in [0.5, 1, np.float64(0.5), np.float32(0.5)]:
+                with self.subTest(f"vmath.{func_name}({type(x).__name__}({x}))"):
+                    self.assertIs(type(vmath_func(x)), float)
+
     def test_asin_calculations(self):
-        """ Basic suite of tests for the acos function calculations """
+        """ Basic suite of tests for the arcsin function calculations """
         self.__test_calcs(vmath.arcsin, [(0, 0), (0.99, 0), (0.75, 0.01), (-0.63, 0.1)])
 
     def test_acos_calculations(self):
-        """ Basic suite of tests for the acos function calculations """
+        """ Basic suite of tests for the arccos function calculations """
         self.__test_calcs(vmath.arccos, [(0, 0), (0.99, 0), (0.75, 0.01), (-0.63, 0.1)])
 
     def test_atan_calculations(self):
-        """ Basic suite of tests for the atan function calculations """
+        """ Basic suite of tests for the arctan function calculations """
         self.__test_calcs(vmath.arctan, [(0, 0), (0.99, 0), (0.75, 0.01), (-0.63, 0.1)])
 
     def test_exp_calculations(self):
@@ -50,58 +74,47 @@ class Testvmath(unittest.TestCase):
         self.__test_calcs(vmath.exp, [(0, 0), (2.0, 0), (0.5, 0.01), (13.5, 0.21), (-0.75, 0.1)])
 
     def test_log10_calculations(self):
-        """ Basic suite of tests for the exp function calculations """
+        """ Basic suite of tests for the log10 function calculations """
         self.__test_calcs(vmath.log10, [(0.001, 0), (0.5, 0.01), (1.66, 0.121), (10.54, 0.5)])
 
 
     # pylint: disable=too-many-locals
     def __test_calcs(self, vmath_func, list_of_num_unc_vals: List[Tuple[float, float]]):
         """ Basic happy path tests of degrees() to assert correct results """
-        umath_names = {  # for when numpy & umath/math use different func names
-            "arcsin": "asin",
-            "arccos": "acos",
-            "arctan": "atan"
-        }
-
         func_name = vmath_func.__name__
-        numpy_func = getattr(np, func_name)
-        umath_func = getattr(umath, umath_names.get(func_name, func_name))
-
-        # pylint: disable=too-many-arguments, too-many-locals
-        def assert_result(self, x, expected, actual, ix: int=None):
-            """ General assertEqual which handles UFloats """
-            msg = f"vmath.{func_name}({x})" + (f"[{ix}]" if ix is not None else "")
-            if isinstance(expected, UFloat):
-                self.assertIsInstance(actual, UFloat, msg + f": {actual} expected to be a UFloat")
-                for (lbl, exp, act) in [("n", expected.n, actual.n), ("s", expected.s, actual.s)]:
-                    self.assertAlmostEqual(exp, act, 12, msg + f".{lbl}: actual {act} != expected {exp}")
-            else:
-                self.assertAlmostEqual(expected, actual, 12, msg + f": {actual} != expected {expected}")
+        numpy_func, umath_func = _REFERENCE_FUNCS[func_name]
 
         for (nom, unc) in list_of_num_unc_vals:
-            # Calculate the expected value from the appropriate reference function
+            # Calculate the expected values once from the appropriate reference function
             uflt = ufloat(nom, unc)
+            exp_nom, exp_uflt = numpy_func(nom), umath_func(uflt)
             for (x,                             expected) in [
-                (nom,                           numpy_func(nom)),
-                ([nom]*2,                       numpy_func([nom]*2)),
-                (np.array([nom]*2),             numpy_func(np.array([nom]*2))),
-                (uflt,                          umath_func(uflt)),
-                ([uflt]*2,                      np.array([umath_func(uflt)]*2)),
-                (np.array([uflt]*2),            np.array([umath_func(uflt)]*2)),
+                (nom,                           exp_nom),
+                ([nom]*2,                       np.array([exp_nom]*2)),
+                (np.array([nom]*2),             np.array([exp_nom]*2)),
+                (uflt,                          exp_uflt),
+                ([uflt]*2,                      np.array([exp_uflt]*2)),
+                (np.array([uflt]*2),            np.array([exp_uflt]*2)),
 
                 # 2-d array; 1 column of floats and another of UFloats -> 2-d array of UFloats
-                (np.array([[nom]*2, [uflt]*2]), np.array([[ufloat(numpy_func(nom), 0)]*2, [umath_func(uflt)]*2])),
+                (np.array([[nom]*2, [uflt]*2]), np.array([[ufloat(exp_nom, 0)]*2, [exp_uflt]*2])),
             ]:
                 actual = vmath_func(x)
+                msg = f"vmath.{func_name}({x})=={actual}"
                 if isinstance(expected, np.ndarray):
-                    msg = f"{func_name}({x})=={actual}"
                     self.assertIsInstance(actual, np.ndarray, msg + ": output not ndarray")
-                    self.assertEqual(len(expected), len(actual), msg + ": input/output lengths differ")
-                    for (ix, (x, exp, act)) in enumerate(zip(x, expected.flatten(), actual.flatten())):
-                        assert_result(self, x, exp, act, ix)
-                else:
-                    assert_result(self, nom, expected, actual)
-
+                    self.assertEqual(expected.shape, actual.shape, msg + ": input/output shapes differ")
+                elif isinstance(expected, UFloat):
+                    self.assertIsInstance(actual, UFloat, msg + ": expected to be a UFloat")
+                self._assert_uarrays(np.atleast_1d(expected), np.atleast_1d(actual), msg=msg)
+
+    def _assert_uarrays(self, expected: np.ndarray, actual: np.ndarray, places: int=12, msg: str=None):
+        """ Asserts the arrays' nominals & std_devs match to places & actual holds UFloats where expected does """
+        if expected.dtype == object:
+            self.assertTrue(all(isinstance(a, UFloat) for a in actual.flat), f"{msg}: expected UFloats")
+        for (lbl, func) in [("n", unumpy.nominal_values), ("s", unumpy.std_devs)]:
+            np.testing.assert_allclose(func(actual), func(expected), rtol=0, atol=0.5 * 10**-places,
+                                       err_msg=f"{msg}.{lbl}")
 
     def test_wrap_func_for_uncertainties(self):
         """ Basic happy path tests of wrap_func_for_uncertainties() to assert correct tags """
@@ -110,23 +123,35 @@ class Testvmath(unittest.TestCase):
 
         wrapped_test_func = vmath.wrap_func_for_uncertainties(test_func)
 
-        res = wrapped_test_func(dividend=ufloat(10, 1), divisor=ufloat(2, 0.5))
-        print("contribs:", ", ".join(f"{v.tag}={e:.6f}" for v, e in res.error_components().items()))
-
-        res = wrapped_test_func(ufloat(10, 1), divisor=ufloat(2, 0.5))
-        print("contribs:", ", ".join(f"{v.tag}={e:.6f}" for v, e in res.error_components().items()))
-
-        res = wrapped_test_func(ufloat(10, 1), ufloat(2, 0.5))
-        print("contribs:", ", ".join(f"{v.tag}={e:.6f}" for v, e in res.error_components().items()))
-
-        res = wrapped_test_func(dividend=ufloat(10, 1), divisor=ufloat(2, 0.5, "DIB"))
-        print("contribs:", ", ".join(f"{v.tag}={e:.6f}" for v, e in res.error_components().items()))
-
-        res = wrapped_test_func(dividend=10, divisor=ufloat(2, 0.5))
-        print("contribs:", ", ".join(f"{v.tag}={e:.6f}" for v, e in res.error_components().items()))
-    
-        res = wrapped_test_func(dividend=ufloat(10, 1), divisor=ufloat(2, 0.5), some_text="Boo!")
-        print("contribs:", ", ".join(f"{v.tag}={e:.6f}" for v, e in res.error_components().items()))
+        for (args,                          kwargs,                                                     exp_tags) in [
+            ((),                            {"dividend": ufloat(10, 1), "divisor": ufloat(2, 0.5)},     ["dividend", "divisor"]),
+            ((ufloat(10, 1),),              {"divisor": ufloat(2, 0.5)},                                ["args[0]", "divisor"]),
+            ((ufloat(10, 1), ufloat(2, 0.5)), {},                                                       ["args[0]", "args[1]"]),
+            ((),                            {"dividend": ufloat(10, 1), "divisor": ufloat(2, 0.5, "DIB")}, ["DIB", "dividend"]),
+            ((),                            {"dividend": 10, "divisor": ufloat(2, 0.5)},                ["divisor"]),
+            ((),                            {"dividend": ufloat(10, 1), "divisor": ufloat(2, 0.5), "some_text": "Boo!"}, ["dividend", "divisor"]),
+        ]:
+            with self.subTest(f"args={args}, kwargs={kwargs}"):
+                res = wrapped_test_func(*args, **kwargs)
+                self.assertEqual(exp_tags, sorted(v.tag for v in res.error_components()))
+
+    def test_ufloat_from_derivatives(self):
+        """ Basic happy path tests of ufloat_from_derivatives() against the equivalent UFloat calculation """
+        x, y = ufloat(3.0, 0.1), ufloat(2.0, 0.3)
+        expected = x * y**2
+        actual = vmath.ufloat_from_derivatives(x.n * y.n**2, [(x, y.n**2), (y, 2 * x.n * y.n)])
+        self.assertIsInstance(actual, UFloat)
+        self.assertAlmostEqual(expected.n, actual.n, 12)
+        self.assertAlmostEqual(expected.s, actual.s, 12)
+        self.assertAlmostEqual((expected - actual).s, 0, 12) # fully correlated with the same inputs
+
+        # A 0-d ndarray[UFloat] arg is treated the same as the UFloat it holds
+        actual = vmath.ufloat_from_derivatives(x.n * y.n**2, [(np.array(x), y.n**2), (y, 2 * x.n * y.n)])
+        self.assertAlmostEqual(expected.s, actual.s, 12)
+        self.assertAlmostEqual((expected - actual).s, 0, 12)
+
+        # No UFloats -> no uncertainty machinery; just the nominal value
+        self.assertEqual(12.0, vmath.ufloat_from_derivatives(12.0, [(3.0, 4.0), (2.0, 12.0)]))
 
 if __name__ == "__main__":
     unittest.main()